@@ -1,14 +1,416 @@
 
+## Logging Status Messages Instead of Printing Them:
+import contextlib
+import logging
+import logging.handlers
+import queue
+import sys
+
+class ConsoleOutputHandler(logging.StreamHandler):
+    """Writes bare status messages to the current sys.stdout, the way the lessons print them"""
+    
+    def __init__(self, level=logging.NOTSET, stream=None):
+        """
+        Args:
+            level: Lowest level the handler writes
+            stream: File-like object to write to, or None to follow sys.stdout
+        """
+        super().__init__()
+        self.stream = stream  # StreamHandler defaulted it to sys.stderr
+        self.setLevel(level)
+        self.setFormatter(logging.Formatter('%(message)s'))
+    
+    @property
+    def stream(self):
+        if self._stream is None:
+            return sys.stdout  # Looked up per record so redirect_stdout() still works
+        return self._stream
+    
+    @stream.setter
+    def stream(self, value):
+        # setStream() and StreamHandler.__init__ assign here; None means "follow sys.stdout"
+        self._stream = value
+
+def enable_console_output(level=logging.DEBUG):
+    """
+    Opt in to human-readable status lines ("✓ Found: ...") on the console
+    
+    The location classes log to the 'weather_locations' logger and stay silent
+    unless the application configures logging; the lessons turn this on.
+    """
+    pipeline_log = logging.getLogger('weather_locations')
+    pipeline_log.setLevel(level)
+    for handler in pipeline_log.handlers:
+        if isinstance(handler, ConsoleOutputHandler):
+            return handler
+    
+    handler = ConsoleOutputHandler()
+    pipeline_log.addHandler(handler)
+    return handler
+
+def disable_console_output():
+    """Remove the handler added by enable_console_output()"""
+    pipeline_log = logging.getLogger('weather_locations')
+    for handler in list(pipeline_log.handlers):
+        if isinstance(handler, ConsoleOutputHandler):
+            pipeline_log.removeHandler(handler)
+
+@contextlib.contextmanager
+def silenced_logs():
+    """
+    Drop every pipeline log record for a while (benchmarks time the code, not the console)
+    
+    Raising the level means a log call stops at its level check, so nothing is
+    formatted; redirecting stdout would still pay for building every message.
+    """
+    pipeline_log = logging.getLogger('weather_locations')
+    previous_level = pipeline_log.level
+    pipeline_log.setLevel(logging.CRITICAL + 1)
+    try:
+        yield
+    finally:
+        pipeline_log.setLevel(previous_level)
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread"""
+    
+    def prepare(self, record):
+        # The stock prepare() merges msg % args in the caller; our args are plain values
+        return record
+
+class AsyncLogSink:
+    """
+    Queue-based logging: request threads only enqueue records, and a listener
+    thread formats them and does the (possibly slow) console or file I/O
+    """
+    
+    def __init__(self, *handlers, level=logging.INFO, logger_name='weather_locations'):
+        """
+        Args:
+            handlers: Handlers the listener thread writes to (e.g. ConsoleOutputHandler())
+            level: Lowest level passed on; below it a log call is one integer comparison
+            logger_name: Logger to attach to
+        """
+        self.logger = logging.getLogger(logger_name)
+        self.level = level
+        self.queue = queue.SimpleQueue()
+        self.queue_handler = DeferredQueueHandler(self.queue)
+        self.listener = logging.handlers.QueueListener(self.queue, *handlers, respect_handler_level=True)
+        self.previous_level = None
+    
+    def start(self):
+        self.previous_level = self.logger.level
+        self.logger.setLevel(self.level)
+        self.logger.addHandler(self.queue_handler)
+        self.listener.start()
+        return self
+    
+    def stop(self):
+        """Detach from the logger and write out everything still queued"""
+        self.logger.removeHandler(self.queue_handler)
+        self.logger.setLevel(self.previous_level)
+        self.listener.stop()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.stop()
+
+## Scheduling Requests Within a Rate Limit:
+import heapq
+import threading
+import time
+
+# Request priorities (lower numbers are sent first)
+PRIORITY_INTERACTIVE = 0   # A user is waiting on a geocode or reverse geocode
+PRIORITY_AUTOCOMPLETE = 1  # Keystroke suggestions that may be thrown away
+PRIORITY_BACKGROUND = 2    # Prefetching and batch warm-up work
+
+class RequestCancelled(Exception):
+    """Raised when a queued request is cancelled before it is sent"""
+
+class RequestScheduler:
+    """Token-bucket rate limiter that releases waiting requests in priority order"""
+    
+    def __init__(self, requests_per_second=1.0, burst=1):
+        """
+        Args:
+            requests_per_second: Sustained request budget (Nominatim allows at most 1/sec)
+            burst: How many requests may go out back-to-back after an idle period
+        """
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
+        
+        self.condition = threading.Condition()
+        self.waiting = []  # Heap of (priority, arrival number) tickets
+        self.arrivals = 0
+        
+        self.stats = {
+            'requests': 0,
+            'total_wait': 0.0,
+            'max_wait': 0.0,
+            'max_queue_depth': 0,
+            'by_priority': {}
+        }
+    
+    def _refill(self):
+        """Add the tokens earned since the last refill"""
+        now = time.monotonic()
+        earned = (now - self.last_refill) * self.requests_per_second
+        self.tokens = min(self.burst, self.tokens + earned)
+        self.last_refill = now
+    
+    def acquire(self, priority=PRIORITY_INTERACTIVE, cancelled=None):
+        """
+        Block until a request with this priority may be sent
+        
+        Args:
+            priority: One of the PRIORITY_* constants
+            cancelled: Optional function returning True once the caller no longer needs the request
+        
+        Returns:
+            Seconds spent waiting in the queue
+        
+        Raises:
+            RequestCancelled: if cancelled() became True while waiting
+        """
+        start = time.monotonic()
+        
+        with self.condition:
+            ticket = (priority, self.arrivals)
+            self.arrivals += 1
+            heapq.heappush(self.waiting, ticket)
+            self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], len(self.waiting))
+            
+            while True:
+                if cancelled and cancelled():
+                    # Leave the queue without spending a token
+                    self.waiting.remove(ticket)
+                    heapq.heapify(self.waiting)
+                    self.condition.notify_all()
+                    raise RequestCancelled(f"Request cancelled after {time.monotonic() - start:.2f}s in queue")
+                
+                self._refill()
+                is_next = self.waiting[0] == ticket
+                
+                if is_next and self.tokens >= 1:
+                    heapq.heappop(self.waiting)
+                    self.tokens -= 1
+                    break
+                
+                # Only the head of the queue needs to wake up when the next token is due
+                timeout = (1 - self.tokens) / self.requests_per_second if is_next else None
+                if cancelled:
+                    timeout = min(timeout or 0.05, 0.05)  # Check for cancellation regularly
+                self.condition.wait(timeout)
+            
+            # Let the new head of the queue check for a token
+            self.condition.notify_all()
+            
+            waited = time.monotonic() - start
+            self._record_wait(priority, waited)
+        
+        return waited
+    
+    def _record_wait(self, priority, waited):
+        """Update wait-time statistics (caller holds the lock)"""
+        self.stats['requests'] += 1
+        self.stats['total_wait'] += waited
+        self.stats['max_wait'] = max(self.stats['max_wait'], waited)
+        
+        bucket = self.stats['by_priority'].setdefault(priority, {'requests': 0, 'total_wait': 0.0})
+        bucket['requests'] += 1
+        bucket['total_wait'] += waited
+    
+    def get_stats(self):
+        """Report queue depth and wait times"""
+        with self.condition:
+            requests_sent = self.stats['requests']
+            return {
+                'queue_depth': len(self.waiting),
+                'max_queue_depth': self.stats['max_queue_depth'],
+                'requests': requests_sent,
+                'average_wait': self.stats['total_wait'] / requests_sent if requests_sent else 0.0,
+                'max_wait': self.stats['max_wait'],
+                'average_wait_by_priority': {
+                    priority: bucket['total_wait'] / bucket['requests']
+                    for priority, bucket in sorted(self.stats['by_priority'].items())
+                }
+            }
+
+## Sharing Connections with a Pooled Transport:
+import email.utils
+
+# Responses worth retrying: rate limited (429) or a temporary server failure
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+class NominatimTransport:
+    """Shared HTTP transport with connection pooling, keep-alive and retries"""
+    
+    def __init__(self, base_url="https://nominatim.openstreetmap.org", pooled=True,
+                 pool_connections=4, pool_maxsize=10, max_retries=3, backoff_factor=0.5,
+                 scheduler=None, instrumentation=None):
+        """
+        Args:
+            base_url: Root URL of the Nominatim service (or a local stand-in)
+            scheduler: RequestScheduler every request waits on, or None for no rate limit
+            instrumentation: Optional Instrumentation that records status codes, bytes and latency
+            pooled: Reuse keep-alive connections; False opens a new connection per request
+            pool_connections: Number of per-host connection pools to keep
+            pool_maxsize: Maximum open connections kept alive for each host
+            max_retries: Retries for connection errors and 429/5xx responses
+            backoff_factor: Exponential backoff between retries (0.5s, 1s, 2s, ...) unless
+                            the response sends Retry-After
+        """
+        self.base_url = base_url.rstrip('/')
+        self.pooled = pooled
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.headers = {
+            'User-Agent': 'WeatherApp/1.0 (Educational Project)',  # Required by Nominatim
+            'Connection': 'keep-alive'
+        }
+        self.scheduler = scheduler
+        self.instrumentation = instrumentation
+        self.request_count = 0
+        self.count_lock = threading.Lock()  # Many threads share one transport
+        
+        # One long-lived session holds the connection pools for every caller
+        self.session = self._create_session() if pooled else None
+    
+    def _create_session(self):
+        """Create a session whose adapter pools connections and retries connection failures"""
+        # Imported on first use so loading these classes does not pull in the HTTP stack
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        # Error statuses are retried in get() instead, so each retry waits for the scheduler
+        retry = Retry(
+            total=self.max_retries,
+            status=0,
+            backoff_factor=self.backoff_factor,
+            allowed_methods=['GET'],
+            raise_on_status=False  # Hand the final response back so callers see the status code
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=retry
+        )
+        
+        session = requests.Session()
+        session.headers.update(self.headers)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
+    def url_for(self, endpoint):
+        """Build the full URL for an endpoint such as 'search' or 'reverse'"""
+        return f"{self.base_url}/{endpoint}"
+    
+    def get(self, endpoint, params, timeout=10, priority=PRIORITY_INTERACTIVE, cancelled=None):
+        """
+        Send a GET request to a Nominatim endpoint and return the response
+        
+        429 and 5xx responses are retried up to max_retries times. Every attempt
+        waits for the scheduler, so retries stay within the rate limit too; the
+        last response is returned whatever its status.
+        
+        Raises RequestCancelled if cancelled() returns True before the request is sent.
+        """
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(self._retry_delay(response, attempt))
+            
+            if self.scheduler:
+                self.scheduler.acquire(priority, cancelled)
+            if cancelled and cancelled():
+                raise RequestCancelled("Request cancelled before sending")
+            
+            response = self._send_counted(endpoint, params, timeout)
+            if response.status_code not in RETRY_STATUSES:
+                break
+        
+        return response
+    
+    def _retry_delay(self, response, attempt):
+        """Seconds to wait before retrying: the server's Retry-After, else exponential backoff"""
+        retry_after = response.headers.get('Retry-After')
+        if retry_after:
+            if retry_after.strip().isdigit():
+                return float(retry_after)
+            try:
+                retry_at = email.utils.parsedate_to_datetime(retry_after)
+                return max(0.0, retry_at.timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass  # Unparseable header: fall back to backoff
+        return self.backoff_factor * 2 ** (attempt - 1)
+    
+    def _send_counted(self, endpoint, params, timeout):
+        """Send one request, counting it and recording it with the instrumentation"""
+        with self.count_lock:
+            self.request_count += 1
+        
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            return self._send(endpoint, params, timeout)
+        
+        started = time.perf_counter()
+        try:
+            response = self._send(endpoint, params, timeout)
+        except requests.exceptions.RequestException:
+            instrumentation.record_upstream(endpoint, None, 0, time.perf_counter() - started)
+            raise
+        instrumentation.record_upstream(endpoint, response.status_code, len(response.content),
+                                        time.perf_counter() - started)
+        return response
+    
+    def _send(self, endpoint, params, timeout):
+        """Send one GET over the pooled session (or a throwaway one)"""
+        if self.pooled:
+            return self.session.get(self.url_for(endpoint), params=params, timeout=timeout)
+        
+        # Unpooled mode pays for a new TCP+TLS handshake every time (useful for comparisons)
+        with self._create_session() as session:
+            return session.get(self.url_for(endpoint), params=params, timeout=timeout)
+    
+    def close(self):
+        """Close all pooled connections"""
+        if self.session:
+            self.session.close()
+
+_shared_transport = None
+_shared_transport_lock = threading.Lock()
+
+def get_shared_transport():
+    """Return the process-wide transport that all location services share by default"""
+    global _shared_transport
+    with _shared_transport_lock:
+        if _shared_transport is None:
+            # One scheduler keeps all Nominatim traffic within the usage policy
+            _shared_transport = NominatimTransport(scheduler=RequestScheduler(requests_per_second=1.0))
+        return _shared_transport
+
 ## Implementing Geocoding Services:
+class GeocodingUnavailable(Exception):
+    """Raised when a lookup failed (network error, error status), as opposed to finding nothing"""
+
 class SimpleGeocoder:
     """Simple geocoding service using free APIs"""
     
-    def __init__(self):
+    log = logging.getLogger('weather_locations.geocoder')
+    
+    def __init__(self, transport=None, priority=PRIORITY_INTERACTIVE):
         # Using OpenStreetMap Nominatim (free geocoding service)
-        self.base_url = "https://nominatim.openstreetmap.org/search"
-        self.headers = {
-            'User-Agent': 'WeatherApp/1.0 (Educational Project)'  # Required by Nominatim
-        }
+        # All geocoders share one pooled transport unless a stand-in is injected
+        self.transport = transport or get_shared_transport()
+        self.base_url = self.transport.url_for('search')
+        self.priority = priority
     
     def geocode_location(self, location_name):
         """
@@ -19,93 +421,112 @@ class SimpleGeocoder:
             
         Returns:
             dict with latitude, longitude, and display name, or None if not found
+            (or if Nominatim could not be reached; see search_location)
+        """
+        try:
+            return self.search_location(location_name)
+        except GeocodingUnavailable:
+            return None
+    
+    def search_location(self, location_name):
+        """
+        Like geocode_location, but tells "nothing matched" apart from "could not ask"
+        
+        Returns:
+            dict with latitude, longitude, and display name, or None if Nominatim found nothing
+            
+        Raises:
+            GeocodingUnavailable: Network error, error status or unreadable response
         """
         try:
             # Prepare API request
-            params = {
-                'q': location_name,
-                'format': 'json',
-                'limit': 1,  # Only get the best match
-                'addressdetails': 1
-            }
+            params = self._search_params(location_name)
             
-            print(f"Searching for location: {location_name}")
+            self.log.debug("Searching for location: %s", location_name)
             
             # Make API request
-            response = requests.get(
-                self.base_url, 
-                params=params, 
-                headers=self.headers,
-                timeout=10
-            )
+            response = self.transport.get('search', params, timeout=10, priority=self.priority)
+            results = response.json() if response.status_code == 200 else None
             
-            if response.status_code == 200:
-                results = response.json()
-                
-                if results:
-                    # Extract the best result
-                    best_result = results[0]
-                    
-                    location_data = {
-                        'latitude': float(best_result['lat']),
-                        'longitude': float(best_result['lon']),
-                        'display_name': best_result['display_name'],
-                        'type': best_result.get('type', 'location'),
-                        'importance': float(best_result.get('importance', 0))
-                    }
-                    
-                    print(f"✓ Found: {location_data['display_name']}")
-                    return location_data
-                else:
-                    print(f"✗ No results found for '{location_name}'")
-                    return None
-            else:
-                print(f"✗ API error: {response.status_code}")
-                return None
+            # Extract the best result
+            location_data = self._parse_search_result(results[0]) if results else None
                 
         except requests.exceptions.RequestException as e:
-            print(f"✗ Network error: {e}")
-            return None
+            self.log.warning("✗ Network error: %s", e)
+            raise GeocodingUnavailable(str(e)) from e
         except Exception as e:
-            print(f"✗ Unexpected error: {e}")
+            self.log.error("✗ Unexpected error: %s", e)
+            raise GeocodingUnavailable(str(e)) from e
+        
+        if response.status_code != 200:
+            self.log.warning("✗ API error: %s", response.status_code)
+            raise GeocodingUnavailable(f"Nominatim answered HTTP {response.status_code}")
+        
+        if location_data is None:
+            self.log.info("✗ No results found for '%s'", location_name)
             return None
+        
+        self.log.debug("✓ Found: %s", location_data['display_name'])
+        return location_data
     
     def reverse_geocode(self, latitude, longitude):
         """Convert coordinates back to location name"""
         try:
-            reverse_url = "https://nominatim.openstreetmap.org/reverse"
-            params = {
-                'lat': latitude,
-                'lon': longitude,
-                'format': 'json',
-                'addressdetails': 1
-            }
+            params = self._reverse_params(latitude, longitude)
             
-            response = requests.get(
-                reverse_url, 
-                params=params, 
-                headers=self.headers,
-                timeout=10
-            )
+            response = self.transport.get('reverse', params, timeout=10, priority=self.priority)
             
             if response.status_code == 200:
                 result = response.json()
                 
                 if 'display_name' in result:
-                    return {
-                        'display_name': result['display_name'],
-                        'city': result.get('address', {}).get('city', ''),
-                        'state': result.get('address', {}).get('state', ''),
-                        'country': result.get('address', {}).get('country', '')
-                    }
+                    return self._parse_reverse_result(result)
             
             return None
             
         except Exception as e:
-            print(f"Reverse geocoding error: {e}")
+            self.log.warning("Reverse geocoding error: %s", e)
             return None
+    
+    def _search_params(self, location_name):
+        """Query parameters for a forward geocoding request"""
+        return {
+            'q': location_name,
+            'format': 'json',
+            'limit': 1,  # Only get the best match
+            'addressdetails': 1
+        }
+    
+    def _reverse_params(self, latitude, longitude):
+        """Query parameters for a reverse geocoding request"""
+        return {
+            'lat': latitude,
+            'lon': longitude,
+            'format': 'json',
+            'addressdetails': 1
+        }
+    
+    def _parse_search_result(self, best_result):
+        """Convert one Nominatim search result into our location dict"""
+        return {
+            'latitude': float(best_result['lat']),
+            'longitude': float(best_result['lon']),
+            'display_name': best_result['display_name'],
+            'type': best_result.get('type', 'location'),
+            'importance': float(best_result.get('importance', 0))
+        }
+    
+    def _parse_reverse_result(self, result):
+        """Convert a Nominatim reverse result into our place dict"""
+        return {
+            'display_name': result['display_name'],
+            'city': result.get('address', {}).get('city', ''),
+            'state': result.get('address', {}).get('state', ''),
+            'country': result.get('address', {}).get('country', '')
+        }
 
-# Demonstrate geocoding functionality
+# Demonstrate geocoding functionality (the lessons show the pipeline's status messages)
+enable_console_output()
 geocoder = SimpleGeocoder()
 
 print("\nGeocoding Demonstration:")
@@ -1,11 +1,466 @@
+## Bounding the Cache with LRU and TTL Eviction:
+import sys
+from array import array
+from collections import OrderedDict
+from collections.abc import Mapping
+
+class LazyValue:
+    """Encoded cache value that is only decoded the first time it is read"""
+    __slots__ = ('raw', 'decode')
+    
+    def __init__(self, raw, decode):
+        self.raw = raw          # Encoded bytes (e.g. a slice of a snapshot file)
+        self.decode = decode    # Function turning raw into the real value
+    
+    def resolve(self):
+        return self.decode(self.raw)
+
+def estimate_size(value):
+    """Rough in-memory size of a cached value in bytes (follows dicts, lists and tuples)"""
+    size = sys.getsizeof(value)
+    if isinstance(value, LazyValue):
+        return size + len(value.raw)
+    if isinstance(value, Mapping):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(estimate_size(item) for item in value)
+    return size
+
+class BoundedCache:
+    """Least-recently-used cache with entry/byte limits and per-entry expiry"""
+    
+    def __init__(self, max_entries=1000, max_bytes=None, ttl=None, on_evict=None, sizer=estimate_size,
+                 backend=None):
+        """
+        Args:
+            max_entries: Maximum number of entries kept
+            max_bytes: Maximum estimated size of all values, or None for no byte limit
+            ttl: Default time-to-live in seconds, or None to never expire
+            on_evict: Optional callback(key, value, reason) with reason 'capacity' or 'expired'
+            sizer: Function that estimates the size of a value in bytes
+            backend: Optional persistent store such as SQLiteGeocodeCache, with
+                     get_entry(key), put(key, value, stored_at), load_recent(limit) and
+                     clear(); misses read through to it and puts write to it
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self.sizer = sizer
+        self.backend = backend
+        
+        # key -> (value, expires_at, size, stored_at); oldest first. expires_at is on the monotonic
+        # clock, stored_at is wall-clock time so it can be saved and honored after a restart
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.lock = threading.RLock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'backend_hits': 0,
+                      'lazy_decodes': 0}
+    
+    def get(self, key, default=None):
+        """Return a cached value (and mark it recently used), or default on a miss"""
+        with self.lock:
+            entry = self.entries.get(key)
+            
+            if entry is not None:
+                value, expires_at = entry[:2]
+                if expires_at is None or expires_at > time.monotonic():
+                    self.entries.move_to_end(key)
+                    self.stats['hits'] += 1
+                    if isinstance(value, LazyValue):
+                        value = self._decode(key, entry)
+                    return value
+                
+                self._remove(key, 'expired')
+        
+        # Memory miss: try the persistent backend (outside the lock, it may touch disk)
+        if self.backend is not None:
+            entry = self.backend.get_entry(key)
+            # The TTL counts from when the backend row was written, so stale rows stay a miss
+            if entry is not None and self._store(key, entry[0], None, entry[1]):
+                with self.lock:
+                    self.stats['backend_hits'] += 1
+                return entry[0]
+        
+        with self.lock:
+            self.stats['misses'] += 1
+        return default
+    
+    def put(self, key, value, ttl=None, stored_at=None):
+        """
+        Store a value, evicting least-recently-used entries if limits are exceeded
+        
+        Args:
+            ttl: Time-to-live for this entry (the cache's default if None)
+            stored_at: Wall-clock time the value was first cached, for entries restored
+                       from disk; the TTL counts from then, so an expired entry is dropped
+        """
+        if not self._store(key, value, ttl, stored_at):
+            return
+        
+        # Lazy values were read from disk already, so they are not written through
+        if self.backend is not None and not isinstance(value, LazyValue):
+            self.backend.put(key, value, stored_at)
+    
+    def warm(self, limit=None):
+        """Preload the most recently written unexpired backend entries into memory"""
+        if self.backend is None:
+            return 0
+        
+        recent = self.backend.load_recent(limit or self.max_entries)
+        return sum(self._store(key, value, None, stored_at) for key, (value, stored_at) in recent.items())
+    
+    def _store(self, key, value, ttl, stored_at=None):
+        """Insert into memory only, evicting as needed; False if the value had already expired"""
+        now = time.time()
+        age = 0.0 if stored_at is None else max(0.0, now - stored_at)
+        ttl = self.ttl if ttl is None else ttl
+        if ttl is not None and age >= ttl:
+            return False
+        
+        expires_at = time.monotonic() + ttl - age if ttl is not None else None
+        size = self.sizer(value) if self.max_bytes is not None else 0
+        
+        with self.lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)[2]
+            
+            self.entries[key] = (value, expires_at, size, now - age)
+            self.total_bytes += size
+            
+            while len(self.entries) > self.max_entries or \
+                  (self.max_bytes is not None and self.total_bytes > self.max_bytes and len(self.entries) > 1):
+                oldest_key = next(iter(self.entries))
+                self._remove(oldest_key, 'capacity')
+        return True
+    
+    def _decode(self, key, entry):
+        """Replace a LazyValue entry with its decoded value (called with the lock held)"""
+        lazy_value, expires_at, old_size, stored_at = entry
+        value = lazy_value.resolve()
+        size = self.sizer(value) if self.max_bytes is not None else 0
+        
+        self.entries[key] = (value, expires_at, size, stored_at)
+        self.total_bytes += size - old_size
+        self.stats['lazy_decodes'] += 1
+        return value
+    
+    def _remove(self, key, reason):
+        """Drop an entry, update counters and notify the eviction callback"""
+        value, _, size, _ = self.entries.pop(key)
+        self.total_bytes -= size
+        
+        if reason == 'expired':
+            self.stats['expirations'] += 1
+        else:
+            self.stats['evictions'] += 1
+        
+        if self.on_evict:
+            self.on_evict(key, value, reason)
+    
+    def delete(self, key):
+        """Remove an entry without counting it as an eviction"""
+        with self.lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)[2]
+    
+    def clear(self):
+        """Remove every entry, including the backend's, so cleared entries can't be read back"""
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+        
+        if self.backend is not None:
+            self.backend.clear()
+    
+    def __contains__(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            return entry is not None and (entry[1] is None or entry[1] > time.monotonic())
+    
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+    
+    def __setitem__(self, key, value):
+        self.put(key, value)
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def to_dict(self, resolve=True):
+        """
+        Snapshot of the unexpired entries, oldest first (for saving to JSON)
+        
+        Args:
+            resolve: Decode LazyValue entries; pass False to get them as-is (e.g. to copy their raw bytes)
+        """
+        now = time.monotonic()
+        with self.lock:
+            return {
+                key: value.resolve() if resolve and isinstance(value, LazyValue) else value
+                for key, (value, expires_at, _, _) in self.entries.items()
+                if expires_at is None or expires_at > now
+            }
+    
+    def stored_times(self):
+        """Wall-clock time each unexpired entry was cached, to save alongside to_dict()"""
+        now = time.monotonic()
+        with self.lock:
+            return {
+                key: stored_at
+                for key, (_, expires_at, _, stored_at) in self.entries.items()
+                if expires_at is None or expires_at > now
+            }
+    
+    def update(self, items, stored_times=None):
+        """
+        Load entries from a dict, such as one produced by to_dict()
+        
+        Args:
+            stored_times: Optional stored_times() result saved with items; entries keep
+                          their original age instead of starting a fresh TTL
+        """
+        stored_times = stored_times or {}
+        for key, value in items.items():
+            self.put(key, value, stored_at=stored_times.get(key))
+    
+    def get_stats(self):
+        """Report hit/miss/eviction counters and current usage"""
+        with self.lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return dict(
+                self.stats,
+                entries=len(self.entries),
+                bytes=self.total_bytes,
+                hit_rate=self.stats['hits'] / lookups if lookups else 0.0
+            )
+
+_MISSING = object()
+
+## Coalescing Concurrent Identical Lookups:
+class SingleFlight:
+    """Lets concurrent callers asking for the same key share one in-flight call"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = {}  # key -> shared call record
+        self.stats = {'calls': 0, 'coalesced': 0}
+    
+    def do(self, key, function):
+        """
+        Run function() once per key, even if many threads ask at the same time
+        
+        Returns:
+            (result, shared) where shared is True if another caller did the work
+        """
+        with self.lock:
+            call = self.in_flight.get(key)
+            is_leader = call is None
+            
+            if is_leader:
+                call = {'done': threading.Event(), 'result': None, 'error': None}
+                self.in_flight[key] = call
+                self.stats['calls'] += 1
+            else:
+                self.stats['coalesced'] += 1
+        
+        if not is_leader:
+            # Wait for the leader and share its outcome
+            call['done'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return call['result'], True
+        
+        try:
+            call['result'] = function()
+        except Exception as e:
+            call['error'] = e
+            raise
+        finally:
+            with self.lock:
+                del self.in_flight[key]
+            call['done'].set()
+        
+        return call['result'], False
+
+## Compact Location Records:
+class Location(Mapping):
+    """
+    One geocoded place, stored in slots instead of a per-entry dict
+    
+    Reads like a read-only dict (location['latitude'], location.get('short_name'),
+    dict(location)) so existing callers keep working. Name strings are interned,
+    so every record, favorite and history entry for a place shares one copy.
+    """
+    __slots__ = ('display_name', 'short_name', 'latitude', 'longitude', 'type')
+    
+    def __init__(self, display_name, latitude, longitude, type='', short_name=None):
+        self.display_name = sys.intern(display_name)
+        self.short_name = sys.intern(short_name) if short_name is not None else None
+        self.latitude = float(latitude)
+        self.longitude = float(longitude)
+        self.type = sys.intern(type or '')
+    
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['display_name'], data['latitude'], data['longitude'],
+                   data.get('type', ''), data.get('short_name'))
+    
+    @classmethod
+    def coerce(cls, value):
+        """Return value as a Location (cache backends and old files hand back plain dicts)"""
+        return value if isinstance(value, Location) else cls.from_dict(value)
+    
+    def __getitem__(self, key):
+        if key in Location.__slots__:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        raise KeyError(key)
+    
+    def __iter__(self):
+        # A missing short name is left out, just like a dict without that key
+        return (field for field in Location.__slots__ if getattr(self, field) is not None)
+    
+    def __len__(self):
+        return 4 if self.short_name is None else 5
+    
+    def with_input(self, original_input, cleaned_input):
+        """View of this place for one request, adding what that user typed"""
+        return LocationView(self, original_input, cleaned_input)
+    
+    def __repr__(self):
+        return f"Location({dict(self)!r})"
+
+class LocationView(dict):
+    """
+    A cached Location plus the request input that found it (the input is never cached)
+    
+    A plain dict for callers, as responses always were: it can be changed or passed
+    to json.dumps without affecting the shared record, which stays in .location.
+    """
+    __slots__ = ('location',)
+    
+    def __init__(self, location, original_input, cleaned_input):
+        super().__init__(original_input=original_input, cleaned_input=cleaned_input)
+        self.update(location)
+        self.location = location
+    
+    @property
+    def original_input(self):
+        return self['original_input']
+    
+    @property
+    def cleaned_input(self):
+        return self['cleaned_input']
+    
+    def __repr__(self):
+        return f"LocationView({dict.__repr__(self)})"
+
+def json_default(value):
+    """json.dumps(default=...) hook for Location records, views and lazy cache values"""
+    if isinstance(value, LazyValue):
+        return value.resolve()
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+class LocationTable:
+    """
+    Columnar storage for many locations, usable as a BoundedCache backend
+    
+    Coordinates live in two array('d') columns (8 bytes each, no float objects).
+    Rows for the same place ("nyc", "new york", ...) share one names tuple.
+    A BoundedCache in front keeps the hot places as Location records while the
+    bulk stays in this compact form.
+    """
+    
+    def __init__(self):
+        self.rows = {}  # key -> row number, in insertion order
+        self.latitudes = array('d')
+        self.longitudes = array('d')
+        self.names = []           # (display_name, short_name, type) per row
+        self.distinct_names = {}  # Each names tuple stored once
+    
+    def put(self, key, value, stored_at=None):
+        """Store one location (the table keeps no times, so entries never expire)"""
+        location = Location.coerce(value)
+        names = (location.display_name, location.short_name, location.type)
+        names = self.distinct_names.setdefault(names, names)
+        row = self.rows.get(key)
+        
+        if row is None:
+            self.rows[key] = len(self.latitudes)
+            self.latitudes.append(location.latitude)
+            self.longitudes.append(location.longitude)
+            self.names.append(names)
+        else:
+            self.latitudes[row] = location.latitude
+            self.longitudes[row] = location.longitude
+            self.names[row] = names
+    
+    def get(self, key):
+        """Materialize one row as a Location, or return None"""
+        row = self.rows.get(key)
+        if row is None:
+            return None
+        display_name, short_name, place_type = self.names[row]
+        return Location(display_name, self.latitudes[row], self.longitudes[row], place_type, short_name)
+    
+    def get_entry(self, key):
+        """(Location, stored_at) for BoundedCache, or None; stored_at is None since no times are kept"""
+        location = self.get(key)
+        return None if location is None else (location, None)
+    
+    def load_recent(self, limit):
+        """The limit most recently added entries as (Location, None), oldest first (for BoundedCache.warm)"""
+        keys = list(self.rows)[-limit:] if limit else []
+        return {key: (self.get(key), None) for key in keys}
+    
+    def clear(self):
+        """Remove every row"""
+        self.rows.clear()
+        self.latitudes = array('d')
+        self.longitudes = array('d')
+        self.names.clear()
+        self.distinct_names.clear()
+    
+    def __len__(self):
+        return len(self.rows)
+
 ## Creating a Complete Location Service:
 class WeatherLocationService:
-    """Complete location service for weather applications"""
+    """
+    Complete location service for weather applications
     
-    def __init__(self):
+    Safe to share between threads: the cache and in-flight table do their own
+    locking. Cached location dicts are shared by all callers, so treat them as read-only.
+    """
+    
+    log = logging.getLogger('weather_locations.service')
+    
+    def __init__(self, geocoder=None, cache_size=1000, cache_ttl=24 * 60 * 60, cache_backend=None,
+                 place_store=None, instrumentation=None, negative_cache_size=1000, negative_cache_ttl=10 * 60):
         self.validator = LocationValidator()
-        self.geocoder = SimpleGeocoder()
-        self.location_cache = {}  # Simple cache to avoid repeated API calls
+        self.geocoder = geocoder or SimpleGeocoder()
+        # Optional Instrumentation; every stage below checks for None, so off costs almost nothing
+        self.instrumentation = instrumentation
+        # Optional PlaceStore shared with autocomplete: its cache replaces our own
+        self.place_store = place_store
+        if place_store is not None:
+            self.location_cache = place_store.cache
+        else:
+            # Bounded cache to avoid repeated API calls; old coordinates expire after a day
+            self.location_cache = BoundedCache(max_entries=cache_size, ttl=cache_ttl, backend=cache_backend)
+        self.location_cache.warm()  # Start warm from a shared on-disk cache, if any
+        # Names Nominatim found nothing for; kept briefly, since places do get added
+        self.negative_cache = BoundedCache(max_entries=negative_cache_size, ttl=negative_cache_ttl)
+        self.in_flight = SingleFlight()  # Concurrent misses for one city share a request
+        self.stats = {'upstream_calls_saved': 0}
+        self.stats_lock = threading.Lock()
     
     def process_location_request(self, user_input):
         """
@@ -14,10 +469,18 @@ class WeatherLocationService:
         Returns:
             dict with location data ready for weather API, or error information
         """
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            started = time.perf_counter()
+        
         # Step 1: Validate and clean input
         cleaned_location, validation_message = self.validator.clean_location_input(user_input)
+        if instrumentation is not None:
+            started = instrumentation.lap('validate', started)
         
         if not cleaned_location:
+            if instrumentation is not None:
+                instrumentation.count('invalid_inputs')
             return {
                 'success': False,
                 'error': validation_message,
@@ -26,44 +489,86 @@ class WeatherLocationService:
         
         # Step 2: Check cache first
         cache_key = cleaned_location.lower()
-        if cache_key in self.location_cache:
-            cached_result = self.location_cache[cache_key]
-            print(f"Using cached result for '{cleaned_location}'")
+        cached_result = self.location_cache.get(cache_key)
+        if instrumentation is not None:
+            instrumentation.lap('cache_check', started)
+            instrumentation.count('cache_misses' if cached_result is None else 'cache_hits')
+        if cached_result is not None:
+            self.log.debug("Using cached result for '%s'", cleaned_location)
             return {
                 'success': True,
-                'location_data': cached_result,
+                'location_data': Location.coerce(cached_result).with_input(user_input, cleaned_location),
                 'source': 'cache'
             }
         
-        # Step 3: Geocode the location
-        geocode_result = self.geocoder.geocode_location(cleaned_location)
-        
-        if not geocode_result:
-            return {
-                'success': False,
-                'error': f"Could not find location '{cleaned_location}'",
-                'suggestions': self._get_location_suggestions(cleaned_location)
-            }
+        # Step 2b: A recent "not found" answers repeated typos and bot traffic locally
+        if cache_key in self.negative_cache:
+            with self.stats_lock:
+                self.stats['upstream_calls_saved'] += 1
+            if instrumentation is not None:
+                instrumentation.count('negative_cache_hits')
+            self.log.debug("Using cached not-found result for '%s'", cleaned_location)
+            return self._not_found_response(cleaned_location)
         
-        # Step 4: Prepare weather-ready location data
-        weather_location = {
-            'original_input': user_input,
-            'cleaned_input': cleaned_location,
-            'display_name': geocode_result['display_name'],
-            'latitude': geocode_result['latitude'],
-            'longitude': geocode_result['longitude'],
-            'type': geocode_result['type']
-        }
+        # Step 3: Geocode the location (concurrent misses for this key share one call)
+        weather_location, shared = self.in_flight.do(
+            cache_key,
+            lambda: self._geocode_and_cache(cache_key, cleaned_location)
+        )
         
-        # Step 5: Cache the result
-        self.location_cache[cache_key] = weather_location
+        if not weather_location:
+            return self._not_found_response(cleaned_location)
         
         return {
             'success': True,
-            'location_data': weather_location,
-            'source': 'geocoding'
+            'location_data': weather_location.with_input(user_input, cleaned_location),
+            'source': 'coalesced' if shared else 'geocoding'
         }
     
+    def _geocode_and_cache(self, cache_key, cleaned_location):
+        """Geocode a cache miss and store the weather-ready Location"""
+        # Another caller may have filled the cache while we were queued
+        if cache_key in self.location_cache:
+            return Location.coerce(self.location_cache.get(cache_key))
+        if cache_key in self.negative_cache:
+            return None
+        
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            started = time.perf_counter()
+        
+        try:
+            geocode_result = self.geocoder.search_location(cleaned_location)
+        except GeocodingUnavailable:
+            geocode_result = None  # Not remembered: the next request should try again
+        else:
+            if not geocode_result:
+                self.negative_cache.put(cache_key, True)
+        if instrumentation is not None:
+            started = instrumentation.lap('geocode', started)
+        
+        if not geocode_result:
+            return None
+        
+        # Step 4: Prepare weather-ready location data (the request input is added per response)
+        weather_location = Location(
+            geocode_result['display_name'],
+            geocode_result['latitude'],
+            geocode_result['longitude'],
+            geocode_result['type']
+        )
+        if instrumentation is not None:
+            started = instrumentation.lap('shape', started)
+        
+        # Step 5: Cache the result (and let autocomplete offer it)
+        self.location_cache.put(cache_key, weather_location)
+        if self.place_store is not None:
+            self.place_store.learn_location(weather_location, geocode_result.get('importance', 0))
+        if instrumentation is not None:
+            instrumentation.lap('cache_store', started)
+        
+        return weather_location
+    
     def _get_suggestions_for_invalid_input(self, invalid_input):
         """Provide suggestions for invalid location inputs"""
         suggestions = []
@@ -86,6 +591,13 @@ class WeatherLocationService:
         
         return suggestions
     
+    def _not_found_response(self, cleaned_location):
+        return {
+            'success': False,
+            'error': f"Could not find location '{cleaned_location}'",
+            'suggestions': self._get_location_suggestions(cleaned_location)
+        }
+    
     def _get_location_suggestions(self, location_name):
         """Provide suggestions when location is not found"""
         return [
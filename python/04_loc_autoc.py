@@ -1,15 +1,106 @@
 ## Implementing Location Autocomplete:
+class SuggestionRanker:
+    """
+    Streaming top-k selection that deduplicates by name while it selects
+    
+    Candidates are offered one at a time and only the best `limit` distinct names
+    are kept in a small min-heap, so nothing is sorted or built for the rest.
+    """
+    
+    def __init__(self, limit):
+        self.limit = limit
+        self._heap = []       # [score, -arrival, name, item, live]; the worst kept candidate is on top
+        self._entries = {}    # name -> its live heap entry
+        self._arrivals = 0
+        self._stale = 0       # Superseded entries still in the heap
+    
+    def offer(self, name, score, item):
+        """
+        Consider one candidate
+        
+        Args:
+            name: Deduplication key; only the best-scoring candidate per name is kept
+            score: Anything comparable, higher is better (ties go to the earlier candidate)
+            item: Whatever the caller wants back for survivors (e.g. a raw API result)
+            
+        Returns:
+            True if the candidate is currently among the top `limit`
+        """
+        if self.limit <= 0:
+            return False
+        self._arrivals += 1
+        
+        existing = self._entries.get(name)
+        if existing is not None:
+            if score <= existing[0]:
+                return False
+            existing[4] = False  # Superseded: skipped when it reaches the top of the heap
+            self._stale += 1
+            if self._stale > len(self._entries):
+                self._compact()
+        elif len(self._entries) >= self.limit:
+            self._drop_stale()
+            if score <= self._heap[0][0]:
+                return False  # Not better than the worst candidate already kept
+            evicted = heapq.heappop(self._heap)
+            del self._entries[evicted[2]]
+        
+        entry = [score, -self._arrivals, name, item, True]
+        self._entries[name] = entry
+        heapq.heappush(self._heap, entry)
+        return True
+    
+    def _drop_stale(self):
+        while not self._heap[0][4]:
+            heapq.heappop(self._heap)
+            self._stale -= 1
+    
+    def _compact(self):
+        """Rebuild the heap from live entries once dead ones outnumber them, so it stays O(limit)"""
+        self._heap = [entry for entry in self._heap if entry[4]]
+        heapq.heapify(self._heap)
+        self._stale = 0
+    
+    def results(self):
+        """Kept items, best first"""
+        ranked = sorted(self._entries.values(), reverse=True)  # At most `limit` entries
+        return [entry[3] for entry in ranked]
+    
+    @classmethod
+    def top(cls, suggestions, limit):
+        """Best `limit` suggestion dicts by importance, one per short name"""
+        ranker = cls(limit)
+        for suggestion in suggestions:
+            ranker.offer(suggestion['short_name'], suggestion.get('importance', 0), suggestion)
+        return ranker.results()
+
 class LocationAutocomplete:
     """Provides autocomplete suggestions for location searches"""
     
-    def __init__(self):
-        self.base_url = "https://nominatim.openstreetmap.org/search"
-        self.headers = {
-            'User-Agent': 'WeatherApp/1.0 (Educational Project)'
-        }
+    log = logging.getLogger('weather_locations.autocomplete')
+    
+    def __init__(self, transport=None, cache_size=500, cache_ttl=60 * 60, cache_backend=None,
+                 prefix_index=None, fuzzy_index=None, place_store=None):
+        # Shares the pooled Nominatim transport with the geocoder
+        self.transport = transport or get_shared_transport()
+        self.base_url = self.transport.url_for('search')
         
-        # Cache for autocomplete results
-        self.autocomplete_cache = {}
+        # Optional PlaceStore: suggestions we serve become geocode cache entries there
+        self.place_store = place_store
+        
+        # Optional in-memory prefix index (see PrefixIndex); the API only backfills rare prefixes
+        if prefix_index is None and place_store is not None:
+            prefix_index = place_store.prefix_index
+        self.prefix_index = prefix_index
+        # Optional typo-tolerant index (see FuzzyPlaceIndex) for names the API does not recognise
+        self.fuzzy_index = fuzzy_index
+        self.stats = {'local_hits': 0, 'cache_hits': 0, 'refinement_hits': 0,
+                      'upstream_calls': 0, 'upstream_calls_saved': 0, 'corrections': 0}
+        self.stats_lock = threading.Lock()  # One instance serves every thread (and tenant)
+        
+        # Bounded cache for autocomplete results (suggestions go stale after an hour)
+        self.autocomplete_cache = BoundedCache(max_entries=cache_size, ttl=cache_ttl, backend=cache_backend)
+        self.autocomplete_cache.warm()
         
         # Common locations to prioritize in suggestions
         self.popular_locations = [
@@ -19,13 +110,14 @@ class LocationAutocomplete:
             "Berlin, Germany", "Sydney, Australia", "Toronto, Canada"
         ]
     
-    def get_location_suggestions(self, partial_input, max_suggestions=5):
+    def get_location_suggestions(self, partial_input, max_suggestions=5, cancelled=None):
         """
         Get location suggestions based on partial user input
         
         Args:
             partial_input: What the user has typed so far
             max_suggestions: Maximum number of suggestions to return
+            cancelled: Optional function returning True once the result is no longer wanted
             
         Returns:
             List of location suggestions with relevant data
@@ -36,50 +128,100 @@ class LocationAutocomplete:
         
         cleaned_input = partial_input.strip().lower()
         
-        # Check cache first
-        cache_key = f"{cleaned_input}_{max_suggestions}"
-        if cache_key in self.autocomplete_cache:
-            return self.autocomplete_cache[cache_key]
+        # Answer from the local prefix index when it knows enough places
+        local_suggestions = []
+        if self.prefix_index is not None:
+            local_suggestions = self.prefix_index.search(cleaned_input, max_suggestions)
+            if len(local_suggestions) >= max_suggestions:
+                self._count('local_hits')
+                return self._learned(local_suggestions)
+        
+        # Check cache next (entries are keyed by prefix and hold every ranked candidate)
+        cached_entry = self.autocomplete_cache.get(cleaned_input)
+        if cached_entry is not None and self._entry_covers(cached_entry, max_suggestions):
+            if not cached_entry['suggestions']:
+                return self._get_corrected_suggestions(partial_input, max_suggestions)
+            self._count('cache_hits')
+            return cached_entry['suggestions'][:max_suggestions]
+        
+        # Typing "Lond" after "Lon": filter the cached "Lon" candidates instead of calling the API
+        refined_suggestions = self._refine_from_ancestor(cleaned_input, max_suggestions)
+        if refined_suggestions:
+            self._count('refinement_hits', 'upstream_calls_saved')
+            return refined_suggestions[:max_suggestions]
+        if refined_suggestions is not None:
+            # Nothing the API knows starts with this: typing "Chicg" after "Chic" is a misspelling
+            return self._get_corrected_suggestions(partial_input, max_suggestions)
         
         try:
             # API request for autocomplete
+            limit = max_suggestions * 2  # Get more results to filter
             params = {
                 'q': partial_input,
                 'format': 'json',
-                'limit': max_suggestions * 2,  # Get more results to filter
+                'limit': limit,
                 'addressdetails': 1,
                 'extratags': 1
             }
             
-            response = requests.get(
-                self.base_url, 
-                params=params, 
-                headers=self.headers,
-                timeout=5  # Shorter timeout for autocomplete
+            response = self.transport.get(
+                'search',
+                params,
+                timeout=5,  # Shorter timeout for autocomplete
+                priority=PRIORITY_AUTOCOMPLETE,  # Real geocodes go first
+                cancelled=cancelled
             )
+            self._count('upstream_calls')
             
             if response.status_code == 200:
                 results = response.json()
-                suggestions = self._process_autocomplete_results(results, max_suggestions)
+                # Keep every ranked candidate so longer prefixes can be refined from them
+                suggestions = self._process_autocomplete_results(results, limit)
+                
+                if self.prefix_index is not None:
+                    # Remember these places locally and merge in what the index already had
+                    self.prefix_index.learn(suggestions)
+                    suggestions = self._merge_suggestions(local_suggestions, suggestions, limit)
+                
+                if self.place_store is not None:
+                    # Picking one of these later should not need a second lookup
+                    self.place_store.learn_suggestions(suggestions)
+                
+                if not suggestions:
+                    # Nothing matched: the user probably misspelled the place ("Chicgo")
+                    suggestions = self._get_corrected_suggestions(partial_input, limit)
                 
                 # Cache the results
-                self.autocomplete_cache[cache_key] = suggestions
+                self.autocomplete_cache.put(cleaned_input, {
+                    'suggestions': suggestions,
+                    'limit': limit,
+                    'refined': False,
+                    'exhaustive': len(results) < limit  # The API had nothing more to offer
+                })
                 
-                return suggestions
+                return suggestions[:max_suggestions]
             else:
-                print(f"Autocomplete API error: {response.status_code}")
+                self.log.warning("Autocomplete API error: %s", response.status_code)
                 return self._get_fallback_suggestions(partial_input, max_suggestions)
                 
         except requests.exceptions.RequestException as e:
-            print(f"Autocomplete network error: {e}")
+            self.log.warning("Autocomplete network error: %s", e)
             return self._get_fallback_suggestions(partial_input, max_suggestions)
+        except RequestCancelled:
+            return []  # Nobody is waiting for this prefix any more
         except Exception as e:
-            print(f"Autocomplete error: {e}")
+            self.log.error("Autocomplete error: %s", e)
             return []
     
+    def _count(self, *names):
+        with self.stats_lock:
+            for name in names:
+                self.stats[name] += 1
+    
     def _process_autocomplete_results(self, api_results, max_suggestions):
         """Process and rank autocomplete results"""
-        suggestions = []
+        # Rank raw results as they stream past; only survivors become suggestion dicts
+        ranker = SuggestionRanker(max_suggestions)
         
         for result in api_results:
             # Filter for appropriate location types
@@ -90,36 +232,76 @@ class LocationAutocomplete:
             if location_type in ['city', 'town', 'village', 'hamlet'] or \
                class_type in ['place', 'boundary']:
                 
-                suggestion = {
-                    'display_name': result['display_name'],
-                    'short_name': self._create_short_name(result),
-                    'latitude': float(result['lat']),
-                    'longitude': float(result['lon']),
-                    'type': location_type,
-                    'importance': float(result.get('importance', 0)),
-                    'country': result.get('address', {}).get('country', ''),
-                    'state': result.get('address', {}).get('state', '')
-                }
-                
-                suggestions.append(suggestion)
+                short_name = self._create_short_name(result)
+                ranker.offer(short_name, float(result.get('importance', 0)), (short_name, result))
         
-        # Sort by importance (higher is better)
-        suggestions.sort(key=lambda x: x['importance'], reverse=True)
-        
-        # Remove duplicates and limit results
-        unique_suggestions = []
-        seen_names = set()
+        return [self._build_suggestion(short_name, result) for short_name, result in ranker.results()]
+    
+    def _build_suggestion(self, short_name, result):
+        """Turn one raw API result into a suggestion dict"""
+        return {
+            'display_name': result['display_name'],
+            'short_name': short_name,
+            'latitude': float(result['lat']),
+            'longitude': float(result['lon']),
+            'type': result.get('type', ''),
+            'importance': float(result.get('importance', 0)),
+            'country': result.get('address', {}).get('country', ''),
+            'state': result.get('address', {}).get('state', '')
+        }
+    
+    def _entry_covers(self, entry, max_suggestions):
+        """Whether a cached entry can answer a request for max_suggestions"""
+        if len(entry['suggestions']) >= max_suggestions or entry['exhaustive']:
+            return True
+        # A short API answer is still what the API would say if we asked for enough results
+        return not entry['refined'] and entry['limit'] >= max_suggestions * 2
+    
+    def _refine_from_ancestor(self, cleaned_input, max_suggestions):
+        """
+        Answer a prefix from the cached candidates of its longest cached ancestor prefix
         
-        for suggestion in suggestions:
-            short_name = suggestion['short_name']
-            if short_name not in seen_names:
-                unique_suggestions.append(suggestion)
-                seen_names.add(short_name)
-                
-                if len(unique_suggestions) >= max_suggestions:
-                    break
+        Returns:
+            Refined suggestion list, or None if the caller should ask the API
+        """
+        for length in range(len(cleaned_input) - 1, 1, -1):
+            # One get() so an entry expiring between a check and the read can't come back as None
+            entry = self.autocomplete_cache.get(cleaned_input[:length])
+            if entry is None:
+                continue
+            
+            matches = [suggestion for suggestion in entry['suggestions']
+                       if self._matches_prefix(suggestion, cleaned_input)]
+            
+            if len(matches) < max_suggestions and not entry['exhaustive']:
+                return None  # Too few survivors: the API may know places the ancestor missed
+            
+            # Re-rank: names that start with the prefix beat mid-name word matches
+            matches.sort(key=lambda x: (not x['short_name'].lower().startswith(cleaned_input),
+                                        -x.get('importance', 0)))
+            
+            self.autocomplete_cache.put(cleaned_input, {
+                'suggestions': matches,
+                'limit': entry['limit'],
+                'refined': True,
+                'exhaustive': entry['exhaustive']
+            })
+            return matches
         
-        return unique_suggestions
+        return None
+    
+    def _matches_prefix(self, suggestion, prefix):
+        """Whether the suggestion's name, or any word in it, starts with prefix"""
+        prefix = ' '.join(prefix.replace(',', ' ').split())
+        for name in (suggestion['short_name'], suggestion['display_name']):
+            name = ' '.join(name.lower().replace(',', ' ').split())
+            if name.startswith(prefix) or f" {prefix}" in f" {name}":
+                return True
+        return False
+    
+    def _merge_suggestions(self, first, second, max_suggestions):
+        """Combine two suggestion lists, dropping repeated short names and ranking by importance"""
+        return SuggestionRanker.top(first + second, max_suggestions)
     
     def _create_short_name(self, result):
         """Create a short, user-friendly name for display"""
@@ -164,8 +346,28 @@ class LocationAutocomplete:
         return [{'short_name': loc, 'display_name': loc, 'type': 'popular'} 
                for loc in matching[:max_suggestions]]
     
+    def _get_corrected_suggestions(self, partial_input, max_suggestions):
+        """Closest known place names to a misspelled input (empty without a fuzzy index)"""
+        if self.fuzzy_index is None:
+            return []
+        
+        corrections = self.fuzzy_index.lookup(partial_input, max_suggestions)
+        if corrections:
+            self._count('corrections')
+        return self._learned(corrections)
+    
+    def _learned(self, suggestions):
+        """Pass locally answered suggestions to the place store, so picking one needs no geocode lookup"""
+        if self.place_store is not None and suggestions:
+            self.place_store.learn_suggestions(suggestions)
+        return suggestions
+    
     def _get_fallback_suggestions(self, partial_input, max_suggestions):
         """Provide fallback suggestions when API is unavailable"""
+        corrections = self._get_corrected_suggestions(partial_input, max_suggestions)
+        if corrections:
+            return corrections
+        
         return [
             {'short_name': f"{partial_input.title()}, USA", 'display_name': f"{partial_input.title()}, United States", 'type': 'fallback'},
             {'short_name': f"{partial_input.title()}, UK", 'display_name': f"{partial_input.title()}, United Kingdom", 'type': 'fallback'},
@@ -1,10 +1,113 @@
 
+## Debouncing and Cancelling Autocomplete Requests:
+class AutocompleteSession:
+    """Debounced autocomplete for one user: only the latest query's result is delivered"""
+    
+    def __init__(self, autocomplete, debounce_seconds=0.25, max_suggestions=5, on_result=None):
+        """
+        Args:
+            autocomplete: LocationAutocomplete used to look up suggestions
+            debounce_seconds: Quiet period after the last keystroke before a lookup starts
+            max_suggestions: Suggestions requested per lookup
+            on_result: Optional callback(query, suggestions) for each delivered result
+        """
+        self.autocomplete = autocomplete
+        self.debounce_seconds = debounce_seconds
+        self.max_suggestions = max_suggestions
+        self.on_result = on_result
+        
+        self.lock = threading.Lock()
+        self.result_ready = threading.Condition(self.lock)
+        self.generation = 0  # Increases with every submitted query
+        self.timer = None
+        self.lookup_pending = False  # A timer is counting down and has not started its lookup
+        self.latest_result = None  # (generation, query, suggestions)
+        
+        self.stats = {'submitted': 0, 'debounced': 0, 'lookups': 0, 'cancelled': 0, 'delivered': 0}
+    
+    def submit(self, query):
+        """Start (or restart) the debounce window for a new query"""
+        with self.lock:
+            self.generation += 1
+            self.stats['submitted'] += 1
+            
+            # A lookup that hasn't started yet is simply dropped
+            if self.timer is not None:
+                self.timer.cancel()
+                if self.lookup_pending:
+                    self.stats['debounced'] += 1
+            
+            self.timer = threading.Timer(self.debounce_seconds, self._run, args=(self.generation, query))
+            self.timer.daemon = True
+            self.lookup_pending = True
+            self.timer.start()
+            return self.generation
+    
+    def _is_stale(self, generation):
+        return generation != self.generation
+    
+    def _run(self, generation, query):
+        """Look up suggestions unless a newer query arrived in the meantime"""
+        with self.lock:
+            if self._is_stale(generation):
+                return  # Already counted as debounced by submit()
+            self.lookup_pending = False
+            self.stats['lookups'] += 1
+        
+        # An older prefix waiting in the rate-limit queue is cancelled when a newer one arrives
+        suggestions = self.autocomplete.get_location_suggestions(
+            query, self.max_suggestions, cancelled=lambda: self._is_stale(generation)
+        )
+        
+        with self.lock:
+            if self._is_stale(generation):
+                self.stats['cancelled'] += 1
+                return
+            
+            self.latest_result = (generation, query, suggestions)
+            self.stats['delivered'] += 1
+            self.result_ready.notify_all()
+        
+        if self.on_result:
+            self.on_result(query, suggestions)
+    
+    def wait(self, timeout=None):
+        """
+        Wait for the result of the most recent query
+        
+        Returns:
+            (query, suggestions), or None if it did not arrive within timeout
+        """
+        with self.lock:
+            is_ready = self.result_ready.wait_for(
+                lambda: self.latest_result is not None and self.latest_result[0] == self.generation,
+                timeout
+            )
+            if not is_ready:
+                return None
+            return self.latest_result[1], self.latest_result[2]
+    
+    def search(self, query, timeout=None):
+        """Submit a query and wait for its suggestions (for line-by-line input)"""
+        self.submit(query)
+        result = self.wait(timeout)
+        return result[1] if result else []
+    
+    def cancel(self):
+        """Drop any pending or in-flight lookup"""
+        with self.lock:
+            self.generation += 1
+            self.lookup_pending = False
+            if self.timer is not None:
+                self.timer.cancel()
+
 class InteractiveLocationSearch:
     """Interactive location search with advanced features"""
     
-    def __init__(self):
+    def __init__(self, debounce_seconds=0.1):
         self.autocomplete = LocationAutocomplete()
         self.location_service = WeatherLocationService()
+        self.session = AutocompleteSession(self.autocomplete, debounce_seconds=debounce_seconds)
         self.search_history = []
         self.favorites = []
     
@@ -39,8 +142,8 @@ class InteractiveLocationSearch:
                     print("Search history cleared.")
                     continue
                 
-                # Get autocomplete suggestions
-                suggestions = self.autocomplete.get_location_suggestions(user_input, max_suggestions=5)
+                # Get autocomplete suggestions (a newer query cancels an older one)
+                suggestions = self.session.search(user_input)
                 
                 if not suggestions:
                     print(f"No suggestions found for '{user_input}'")
@@ -1,22 +1,292 @@
 import json
 import os
+import struct
 from datetime import datetime
 
+class JSONSnapshotFormat:
+    """User data snapshot as a single JSON document"""
+    name = 'json'
+    
+    def dump(self, data, f):
+        # Cache entries that were never read are decoded only now
+        f.write(json.dumps(data, separators=(',', ':'), default=json_default).encode('utf-8'))
+    
+    def load(self, raw):
+        data = json.loads(raw)
+        if 'location_cache' in data:
+            data['location_cache'] = {key: Location.from_dict(value)
+                                      for key, value in data['location_cache'].items()}
+        return data
+
+class BinarySnapshotFormat:
+    """
+    Snapshot whose cache entries are decoded lazily
+    
+    Layout: magic, header length, entry count, a JSON header with everything but
+    the cache, an index of (key length, value length) pairs, the time each entry
+    was cached (one double per entry), then all keys and all encoded values.
+    Loading decodes the small header and the keys; each cached location stays
+    raw bytes until it is first read.
+    """
+    name = 'binary'
+    MAGIC = b'WLOCSNP2'
+    MAGIC_WITHOUT_TIMES = b'WLOCSNP1'  # Older files: same layout minus the stored times
+    PREFIX = struct.Struct('<8sII')
+    INDEX_ENTRY = struct.Struct('<HI')
+    
+    @classmethod
+    def matches(cls, raw):
+        return raw[:len(cls.MAGIC)] in (cls.MAGIC, cls.MAGIC_WITHOUT_TIMES)
+    
+    def dump(self, data, f):
+        cache_fields = ('location_cache', 'location_cache_times')
+        header = json.dumps({key: value for key, value in data.items() if key not in cache_fields},
+                            separators=(',', ':')).encode('utf-8')
+        cache = data.get('location_cache', {})
+        stored_times = data.get('location_cache_times', {})
+        
+        keys = [key.encode('utf-8') for key in cache]
+        values = [
+            # Entries still waiting to be decoded are copied as-is
+            bytes(value.raw) if isinstance(value, LazyValue) else
+            json.dumps(value, separators=(',', ':'), default=json_default).encode('utf-8')
+            for value in cache.values()
+        ]
+        
+        f.write(self.PREFIX.pack(self.MAGIC, len(header), len(keys)))
+        f.write(header)
+        f.write(b''.join(self.INDEX_ENTRY.pack(len(key), len(value)) for key, value in zip(keys, values)))
+        f.write(array('d', (stored_times.get(key, -1.0) for key in cache)).tobytes())
+        f.write(b''.join(keys))
+        f.write(b''.join(values))
+    
+    def load(self, raw):
+        magic, header_length, entry_count = self.PREFIX.unpack_from(raw)
+        position = self.PREFIX.size
+        data = json.loads(raw[position:position + header_length])
+        position += header_length
+        
+        index_end = position + entry_count * self.INDEX_ENTRY.size
+        lengths = list(self.INDEX_ENTRY.iter_unpack(raw[position:index_end]))
+        
+        stored_times = array('d')
+        if magic == self.MAGIC:
+            stored_times.frombytes(raw[index_end:index_end + entry_count * stored_times.itemsize])
+            index_end += entry_count * stored_times.itemsize
+        
+        view = memoryview(raw)
+        key_position = index_end
+        value_position = index_end + sum(key_length for key_length, _ in lengths)
+        cache = {}
+        for key_length, value_length in lengths:
+            key = str(view[key_position:key_position + key_length], 'utf-8')
+            cache[key] = LazyValue(view[value_position:value_position + value_length], self._decode_value)
+            key_position += key_length
+            value_position += value_length
+        
+        data['location_cache'] = cache
+        data['location_cache_times'] = {key: stored_at for key, stored_at in zip(cache, stored_times)
+                                        if stored_at >= 0}
+        return data
+    
+    @staticmethod
+    def _decode_value(raw):
+        return Location.from_dict(json.loads(bytes(raw)))
+
+class LocationDataJournal:
+    """
+    Append-only change log kept next to the JSON snapshot of user data
+    
+    Changes are buffered and appended in batches (write-behind). Once the log
+    grows long it is folded into a fresh snapshot, written to a temporary file
+    and renamed over the old one so a crash never leaves a half-written file.
+    """
+    
+    def __init__(self, snapshot_path, journal_path=None, batch_size=20, flush_interval=1.0,
+                 compact_after=500, snapshot_format=None):
+        """
+        Args:
+            snapshot_path: JSON file holding the full user data
+            journal_path: Change log file (defaults to snapshot_path + '.journal')
+            batch_size: Number of pending changes that triggers a flush
+            flush_interval: Seconds a change may wait before it is flushed in the background
+            compact_after: Number of logged changes after which a new snapshot is due
+            snapshot_format: JSONSnapshotFormat (default) or BinarySnapshotFormat for new snapshots;
+                             either kind is recognised when loading
+        """
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path or snapshot_path + '.journal'
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.compact_after = compact_after
+        self.snapshot_format = snapshot_format or JSONSnapshotFormat()
+        self.loaded_format = None  # Format of the snapshot found on disk, if any
+        
+        # Bumped by every compaction; log records from older generations are already in the snapshot
+        self.generation = 0
+        self.logged_changes = 0
+        self.pending = []
+        self.lock = threading.Lock()
+        self.timer = None
+        self.stats = {'changes': 0, 'flushes': 0, 'compactions': 0}
+    
+    def load(self):
+        """
+        Read the snapshot and the changes logged since it was written
+        
+        Returns:
+            (snapshot dict or None, list of (operation, args) to replay in order)
+        """
+        snapshot = None
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'rb') as f:
+                raw = f.read()
+            snapshot_format = BinarySnapshotFormat() if BinarySnapshotFormat.matches(raw) else JSONSnapshotFormat()
+            snapshot = snapshot_format.load(raw)
+            self.loaded_format = snapshot_format.name
+            self.generation = snapshot.pop('journal_generation', 0)
+        
+        changes = []
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, 'r') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break  # Torn final line from a crash mid-append
+                    if record['generation'] == self.generation:
+                        changes.append((record['operation'], record['args']))
+        
+        self.logged_changes = len(changes)
+        return snapshot, changes
+    
+    def record(self, operation, *args):
+        """Queue one change; it is appended with the next batch"""
+        with self.lock:
+            self.pending.append({'generation': self.generation, 'operation': operation, 'args': args})
+            self.logged_changes += 1
+            self.stats['changes'] += 1
+            should_flush = len(self.pending) >= self.batch_size
+            
+            if not should_flush and self.timer is None:
+                # Make sure a lone change still reaches the disk soon
+                self.timer = threading.Timer(self.flush_interval, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+        
+        if should_flush:
+            self.flush()
+    
+    def flush(self):
+        """Append all pending changes with a single write"""
+        with self.lock:
+            batch, self.pending = self.pending, []
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            
+            if not batch:
+                return 0
+            
+            with open(self.journal_path, 'a') as f:
+                f.write(''.join(json.dumps(record, default=json_default) + '\n' for record in batch))
+                f.flush()
+                os.fsync(f.fileno())
+            
+            self.stats['flushes'] += 1
+            return len(batch)
+    
+    def needs_compaction(self):
+        return self.logged_changes >= self.compact_after
+    
+    def compact(self, data):
+        """
+        Replace the snapshot with data (the complete current state) and start an empty log
+        """
+        with self.lock:
+            # Pending changes are already part of data
+            self.pending = []
+            self.generation += 1
+            
+            temp_path = self.snapshot_path + '.tmp'
+            with open(temp_path, 'wb') as f:
+                self.snapshot_format.dump(dict(data, journal_generation=self.generation), f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.snapshot_path)  # Atomic: readers see the old or the new file
+            
+            # Records left over from a crash here carry the old generation and are skipped on load
+            open(self.journal_path, 'w').close()
+            self.logged_changes = 0
+            self.stats['compactions'] += 1
+    
+    def close(self):
+        self.flush()
+
 class WeatherLocationManager:
     """Complete location management for weather applications"""
     
-    def __init__(self, data_file="user_locations.json"):
+    log = logging.getLogger('weather_locations.manager')
+    
+    def __init__(self, data_file="user_locations.json", geocoder=None,
+                 cache_size=500, cache_max_bytes=2 * 1024 * 1024, cache_ttl=7 * 24 * 60 * 60,
+                 cache_backend=None, autocomplete_cache_backend=None,
+                 journal_batch_size=20, journal_flush_interval=1.0, compact_after=500,
+                 snapshot_format='json', tenant_of=None, place_store=None, instrumentation=None,
+                 negative_cache_size=1000, negative_cache_ttl=10 * 60):
+        """
+        Args:
+            tenant_of: Optional MultiTenantLocationManager; this manager then holds one user's
+                       data and shares its validator, geocoder, autocomplete and geocode caches
+            place_store: Optional PlaceStore whose cache becomes the location cache and which
+                         autocomplete and geocoding feed each other through
+            instrumentation: Optional Instrumentation for per-stage timings and cache counters
+            negative_cache_size, negative_cache_ttl: How many names Nominatim found nothing for
+                                                     are remembered, and for how long (never saved)
+        """
         self.data_file = data_file
-        self.validator = LocationValidator()
-        self.geocoder = SimpleGeocoder()
-        self.autocomplete = LocationAutocomplete()
+        # Writers take this lock and replace user_data values instead of mutating them
+        # (copy-on-write), so readers never need a lock and always see a consistent value
+        self.write_lock = threading.RLock()
+        # Changes are appended to a journal; the full file is only rewritten on compaction
+        self.journal = LocationDataJournal(data_file, batch_size=journal_batch_size,
+                                           flush_interval=journal_flush_interval,
+                                           compact_after=compact_after,
+                                           snapshot_format=BinarySnapshotFormat() if snapshot_format == 'binary'
+                                           else JSONSnapshotFormat())
+        # A shared cache belongs to the tenant manager and is not saved with this user's data
+        self.owns_cache = tenant_of is None
+        self.place_store = tenant_of.place_store if tenant_of is not None else place_store
+        self.instrumentation = tenant_of.instrumentation if tenant_of is not None else instrumentation
+        if tenant_of is not None:
+            self.validator = tenant_of.validator
+            self.geocoder = tenant_of.geocoder
+            self.autocomplete = tenant_of.autocomplete
+            self.in_flight = tenant_of.in_flight
+            self.negative_cache = tenant_of.negative_cache
+            location_cache = tenant_of.location_cache
+        else:
+            self.validator = LocationValidator()
+            self.geocoder = geocoder or SimpleGeocoder()
+            self.autocomplete = LocationAutocomplete(transport=self.geocoder.transport,
+                                                     cache_backend=autocomplete_cache_backend,
+                                                     place_store=place_store)
+            self.in_flight = SingleFlight()  # Concurrent misses for one city share a request
+            self.negative_cache = BoundedCache(max_entries=negative_cache_size, ttl=negative_cache_ttl)
+            if place_store is not None:
+                location_cache = place_store.cache
+            else:
+                location_cache = BoundedCache(max_entries=cache_size, max_bytes=cache_max_bytes, ttl=cache_ttl,
+                                              backend=cache_backend)
+        self.stats = {'upstream_calls_saved': 0}
+        self.stats_lock = threading.Lock()
         
         # User location data
         self.user_data = {
             'default_location': None,
             'favorite_locations': [],
             'search_history': [],
-            'location_cache': {},
+            'location_cache': location_cache,
             'user_preferences': {
                 'units': 'imperial',
                 'max_history': 20,
@@ -25,30 +295,88 @@ class WeatherLocationManager:
             }
         }
         
-        # Load existing user data
+        # Load existing user data, then any shared on-disk cache entries
         self.load_user_data()
+        if self.owns_cache:
+            self.user_data['location_cache'].warm()
+        
+        # An existing file in the other format is converted right away
+        if self.journal.loaded_format not in (None, self.journal.snapshot_format.name):
+            self.log.info("Migrating %s from %s to %s snapshot format", self.data_file,
+                          self.journal.loaded_format, self.journal.snapshot_format.name)
+            self.save_user_data()
     
     def load_user_data(self):
-        """Load user location data from file"""
+        """Load user location data from the snapshot, then replay the journal"""
         try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r') as f:
-                    saved_data = json.load(f)
-                    self.user_data.update(saved_data)
-                print(f"✓ Loaded user location data from {self.data_file}")
+            saved_data, changes = self.journal.load()
+            if saved_data is not None:
+                # Saved cache entries go into the bounded cache (oldest are evicted first), keeping
+                # their age so a restart does not give expired coordinates a fresh TTL
+                self.user_data['location_cache'].update(saved_data.pop('location_cache', {}),
+                                                        saved_data.pop('location_cache_times', None))
+                self.user_data.update(saved_data)
+            
+            for operation, args in changes:
+                self._apply_change(operation, args)
+            
+            if saved_data is not None or changes:
+                self.log.info("✓ Loaded user location data from %s (+%d journaled changes)",
+                              self.data_file, len(changes))
         except Exception as e:
-            print(f"Could not load user data: {e}")
-            print("Starting with fresh user data")
+            self.log.warning("Could not load user data: %s", e)
+            self.log.info("Starting with fresh user data")
     
     def save_user_data(self):
-        """Save user location data to file"""
+        """Write a complete snapshot of user location data (compacting the journal)"""
         try:
             if self.user_data['user_preferences']['auto_save']:
-                with open(self.data_file, 'w') as f:
-                    json.dump(self.user_data, f, indent=2)
-                print(f"✓ Saved user location data to {self.data_file}")
+                # Holding the write lock keeps changes from slipping in between snapshot and compaction
+                with self.write_lock:
+                    # Unread cache entries stay encoded; the snapshot format decides what to do with them
+                    saved_data = dict(self.user_data,
+                                      location_cache=self.user_data['location_cache'].to_dict(resolve=False),
+                                      location_cache_times=self.user_data['location_cache'].stored_times())
+                    if not self.owns_cache:
+                        del saved_data['location_cache'], saved_data['location_cache_times']
+                    self.journal.compact(saved_data)
+                self.log.debug("✓ Saved user location data to %s", self.data_file)
         except Exception as e:
-            print(f"Could not save user data: {e}")
+            self.log.error("Could not save user data: %s", e)
+    
+    def _record_change(self, operation, *args):
+        """Journal one change to user data, compacting once the journal is long"""
+        if not self.user_data['user_preferences']['auto_save']:
+            return
+        with self.write_lock:
+            try:
+                self.journal.record(operation, *args)
+            except Exception as e:
+                self.log.error("Could not journal change: %s", e)
+                return
+            
+            if self.journal.needs_compaction():
+                self.save_user_data()
+    
+    def _apply_change(self, operation, args):
+        """Replay one journaled change onto user_data"""
+        if operation == 'set':
+            field, value = args
+            self.user_data[field] = value
+        elif operation == 'append':
+            field, value = args
+            self.user_data[field] = self.user_data[field] + [value]
+        elif operation == 'cache_put':
+            key, value, *stored_at = args  # Journals written before stored times have none
+            self.user_data['location_cache'].put(key, Location.from_dict(value),
+                                                 stored_at=stored_at[0] if stored_at else None)
+        elif operation == 'cache_clear':
+            self.user_data['location_cache'].clear()
+    
+    def close(self):
+        """Fold pending changes into the snapshot before exiting"""
+        self.save_user_data()
+        self.journal.close()
     
     def set_default_location(self, location_input):
         """Set user's default location for weather"""
@@ -57,7 +385,7 @@ class WeatherLocationManager:
         
         if result['success']:
             location_data = result['location_data']
-            self.user_data['default_location'] = {
+            default_location = {
                 'name': location_data['display_name'],
                 'short_name': location_data.get('short_name', location_data['display_name']),
                 'latitude': location_data['latitude'],
@@ -65,11 +393,13 @@ class WeatherLocationManager:
                 'set_date': datetime.now().isoformat()
             }
             
-            self.save_user_data()
-            print(f"✓ Default location set to: {self.user_data['default_location']['short_name']}")
+            with self.write_lock:
+                self.user_data['default_location'] = default_location
+                self._record_change('set', 'default_location', default_location)
+            self.log.info("✓ Default location set to: %s", default_location['short_name'])
             return True
         else:
-            print(f"✗ Could not set default location: {result['error']}")
+            self.log.info("✗ Could not set default location: %s", result['error'])
             return False
     
     def add_favorite_location(self, location_input):
@@ -79,27 +409,29 @@ class WeatherLocationManager:
         if result['success']:
             location_data = result['location_data']
             
-            # Check if already in favorites
-            for favorite in self.user_data['favorite_locations']:
-                if favorite['short_name'] == location_data.get('short_name', location_data['display_name']):
-                    print(f"'{location_data['display_name']}' is already in favorites")
-                    return False
-            
-            # Add to favorites
-            favorite = {
-                'name': location_data['display_name'],
-                'short_name': location_data.get('short_name', location_data['display_name']),
-                'latitude': location_data['latitude'],
-                'longitude': location_data['longitude'],
-                'added_date': datetime.now().isoformat()
-            }
-            
-            self.user_data['favorite_locations'].append(favorite)
-            self.save_user_data()
-            print(f"✓ Added '{favorite['short_name']}' to favorites")
+            with self.write_lock:
+                # Check if already in favorites
+                favorites = self.user_data['favorite_locations']
+                for favorite in favorites:
+                    if favorite['short_name'] == location_data.get('short_name', location_data['display_name']):
+                        self.log.info("'%s' is already in favorites", location_data['display_name'])
+                        return False
+                
+                # Add to favorites (as a new list, so readers keep a consistent old one)
+                favorite = {
+                    'name': location_data['display_name'],
+                    'short_name': location_data.get('short_name', location_data['display_name']),
+                    'latitude': location_data['latitude'],
+                    'longitude': location_data['longitude'],
+                    'added_date': datetime.now().isoformat()
+                }
+                
+                self.user_data['favorite_locations'] = favorites + [favorite]
+                self._record_change('append', 'favorite_locations', favorite)
+            self.log.info("✓ Added '%s' to favorites", favorite['short_name'])
             return True
         else:
-            print(f"✗ Could not add to favorites: {result['error']}")
+            self.log.info("✗ Could not add to favorites: %s", result['error'])
             return False
     
     def get_location_for_weather(self, location_input=None):
@@ -113,9 +445,9 @@ class WeatherLocationManager:
             dict with weather-ready location data
         """
         if location_input is None:
-            # Use default location
-            if self.user_data['default_location']:
-                default = self.user_data['default_location']
+            # Use default location (read once: a writer may swap it at any time)
+            default = self.user_data['default_location']
+            if default:
                 return {
                     'success': True,
                     'location_data': {
@@ -153,20 +485,43 @@ class WeatherLocationManager:
     
     def process_location_input(self, location_input):
         """Process any location input through the complete pipeline"""
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            started = time.perf_counter()
+        
         # Step 1: Validate input
         cleaned, validation_msg = self.validator.clean_location_input(location_input)
+        if instrumentation is not None:
+            started = instrumentation.lap('validate', started)
         if not cleaned:
+            if instrumentation is not None:
+                instrumentation.count('invalid_inputs')
             return {'success': False, 'error': validation_msg}
         
         # Step 2: Check cache
         cache_key = cleaned.lower()
-        if cache_key in self.user_data['location_cache']:
-            cached = self.user_data['location_cache'][cache_key]
-            return {'success': True, 'location_data': cached, 'source': 'cache'}
+        cached = self.user_data['location_cache'].get(cache_key)
+        if instrumentation is not None:
+            instrumentation.lap('cache_check', started)
+            instrumentation.count('cache_misses' if cached is None else 'cache_hits')
+        if cached is not None:
+            location_data = Location.coerce(cached).with_input(location_input, cleaned)
+            return {'success': True, 'location_data': location_data, 'source': 'cache'}
         
-        # Step 3: Geocode
-        geocode_result = self.geocoder.geocode_location(cleaned)
-        if not geocode_result:
+        # Step 3: Geocode (concurrent misses for this key share one call), unless
+        # Nominatim recently found nothing for this name
+        if cache_key in self.negative_cache:
+            with self.stats_lock:
+                self.stats['upstream_calls_saved'] += 1
+            if instrumentation is not None:
+                instrumentation.count('negative_cache_hits')
+            location_data = None
+        else:
+            location_data, shared = self.in_flight.do(
+                cache_key,
+                lambda: self._geocode_and_cache(cache_key, cleaned)
+            )
+        if not location_data:
             return {
                 'success': False, 
                 'error': f"Could not find location '{cleaned}'",
@@ -177,22 +532,58 @@ class WeatherLocationManager:
                 ]
             }
         
-        # Step 4: Prepare location data
-        location_data = {
-            'original_input': location_input,
-            'cleaned_input': cleaned,
-            'display_name': geocode_result['display_name'],
-            'short_name': self._create_short_display_name(geocode_result),
-            'latitude': geocode_result['latitude'],
-            'longitude': geocode_result['longitude'],
-            'type': geocode_result['type']
-        }
+        location_data = location_data.with_input(location_input, cleaned)
+        return {'success': True, 'location_data': location_data, 'source': 'coalesced' if shared else 'geocoding'}
+    
+    def _geocode_and_cache(self, cache_key, cleaned):
+        """Geocode a cache miss, then cache and save the resulting Location"""
+        # Another caller may have filled the cache while we were queued
+        if cache_key in self.user_data['location_cache']:
+            return Location.coerce(self.user_data['location_cache'].get(cache_key))
+        if cache_key in self.negative_cache:
+            return None
+        
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            started = time.perf_counter()
+        
+        try:
+            geocode_result = self.geocoder.search_location(cleaned)
+        except GeocodingUnavailable:
+            geocode_result = None  # Network trouble is not remembered; the next request retries
+        else:
+            if not geocode_result:
+                self.negative_cache.put(cache_key, True)
+        if instrumentation is not None:
+            started = instrumentation.lap('geocode', started)
+        if not geocode_result:
+            return None
+        
+        # Step 4: Prepare location data (the request input is added per response, not cached)
+        location_data = Location(
+            geocode_result['display_name'],
+            geocode_result['latitude'],
+            geocode_result['longitude'],
+            geocode_result['type'],
+            short_name=self._create_short_display_name(geocode_result)
+        )
+        if instrumentation is not None:
+            started = instrumentation.lap('shape', started)
         
         # Step 5: Cache the result
-        self.user_data['location_cache'][cache_key] = location_data
-        self.save_user_data()
+        self.user_data['location_cache'].put(cache_key, location_data)
+        if self.place_store is not None:
+            self.place_store.learn_location(location_data, geocode_result.get('importance', 0))
+        if instrumentation is not None:
+            started = instrumentation.lap('cache_store', started)
+        
+        # Step 6: Save it with the user's data
+        if self.owns_cache:
+            self._record_change('cache_put', cache_key, location_data, time.time())
+            if instrumentation is not None:
+                instrumentation.lap('save', started)
         
-        return {'success': True, 'location_data': location_data, 'source': 'geocoding'}
+        return location_data
     
     def _create_short_display_name(self, geocode_result):
         """Create a short display name from geocoding result"""
@@ -209,11 +600,6 @@ class WeatherLocationManager:
     
     def _add_to_search_history(self, location_data):
         """Add location to search history"""
-        # Remove if already in history
-        history = self.user_data['search_history']
-        history = [item for item in history if item['short_name'] != location_data.get('short_name')]
-        
-        # Add to beginning of history
         history_item = {
             'short_name': location_data.get('short_name', location_data['display_name']),
             'display_name': location_data['display_name'],
@@ -222,11 +608,18 @@ class WeatherLocationManager:
             'search_date': datetime.now().isoformat()
         }
         
-        history.insert(0, history_item)
-        
-        # Limit history size
-        max_history = self.user_data['user_preferences']['max_history']
-        self.user_data['search_history'] = history[:max_history]
+        with self.write_lock:
+            # Remove if already in history
+            history = self.user_data['search_history']
+            history = [item for item in history if item['short_name'] != location_data.get('short_name')]
+            
+            # Add to beginning of history
+            history.insert(0, history_item)
+            
+            # Limit history size
+            max_history = self.user_data['user_preferences']['max_history']
+            self.user_data['search_history'] = history[:max_history]
+            self._record_change('set', 'search_history', self.user_data['search_history'])
     
     def get_user_summary(self):
         """Get a summary of user's location data"""
@@ -240,15 +633,19 @@ class WeatherLocationManager:
     
     def clear_cache(self):
         """Clear location cache"""
-        self.user_data['location_cache'] = {}
-        self.save_user_data()
-        print("✓ Location cache cleared")
+        with self.write_lock:
+            self.user_data['location_cache'].clear()
+            self.negative_cache.clear()
+            if self.owns_cache:
+                self._record_change('cache_clear')
+        self.log.info("✓ Location cache cleared")
     
     def clear_history(self):
         """Clear search history"""
-        self.user_data['search_history'] = []
-        self.save_user_data()
-        print("✓ Search history cleared")
+        with self.write_lock:
+            self.user_data['search_history'] = []
+            self._record_change('set', 'search_history', [])
+        self.log.info("✓ Search history cleared")
 
 # Demonstrate complete location management
 print("\nComplete Location Management Demonstration:")
@@ -287,4 +684,5 @@ summary = location_manager.get_user_summary()
 for key, value in summary.items():
     print(f"  {key.replace('_', ' ').title()}: {value}")
 
+location_manager.close()
 print("\n5. User location data saved to 'demo_user_locations.json'")
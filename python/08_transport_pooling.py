@@ -0,0 +1,155 @@
+## Benchmarking Pooled vs. Unpooled Connections Offline:
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+class LocalNominatimStandIn:
+    """Tiny local HTTP server that answers /search and /reverse like Nominatim"""
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, places=None,
+                 error_rate=0.0, result_count=1, seed=None):
+        """
+        Args:
+            latency: Simulated upstream round-trip time in seconds
+            places: Optional list of Nominatim-style search results; /search returns
+                    those with a word starting with the query instead of echoing it
+            error_rate: Fraction of requests answered with HTTP 503
+            result_count: Results an echoed /search returns (up to its limit)
+            seed: Seed for the error draws so benchmark runs are repeatable
+        """
+        self.latency = latency
+        self.places = places
+        self.error_rate = error_rate
+        self.result_count = result_count
+        self.random = random.Random(seed)
+        self.stats = {'search': 0, 'reverse': 0, 'errors': 0}
+        self.stats_lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._create_handler())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _create_handler(self):
+        """Build a request handler class that serves canned Nominatim responses"""
+
+        stand_in = self
+
+        class StandInHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive needs HTTP/1.1 and a Content-Length
+            disable_nagle_algorithm = True  # Avoid delayed-ACK stalls on reused sockets
+
+            def do_GET(self):
+                if stand_in.latency:
+                    time.sleep(stand_in.latency)
+
+                url = urlparse(self.path)
+                params = parse_qs(url.query)
+                endpoint = url.path.strip('/')
+
+                with stand_in.stats_lock:
+                    if endpoint in stand_in.stats:
+                        stand_in.stats[endpoint] += 1
+                    failed = stand_in.error_rate and stand_in.random.random() < stand_in.error_rate
+                    if failed:
+                        stand_in.stats['errors'] += 1
+
+                if failed:
+                    self._send_json(503, {'error': 'Service temporarily unavailable'})
+                    return
+
+                if url.path == '/search' and stand_in.places is not None:
+                    query = ' '.join(params.get('q', [''])[0].lower().split())
+                    limit = int(params.get('limit', ['10'])[0])
+                    body = [place for place in stand_in.places
+                            if f" {query}" in f" {place['display_name'].lower()}"][:limit]
+                elif url.path == '/search':
+                    query = params.get('q', ['Unknown'])[0]
+                    limit = int(params.get('limit', ['10'])[0])
+                    body = []
+                    for i in range(min(stand_in.result_count, limit)):
+                        name = f"{query} {i}" if i else query
+                        body.append({
+                            'lat': f"{40.7128 + i * 0.01:.4f}",
+                            'lon': '-74.0060',
+                            'display_name': f"{name}, Stand-In County, Test Country",
+                            'type': 'city',
+                            'class': 'place',
+                            'importance': 0.5 - i * 0.01,
+                            'address': {'city': name, 'state': 'Stand-In County', 'country': 'Test Country'}
+                        })
+                elif url.path == '/reverse':
+                    body = {
+                        'display_name': 'Stand-In City, Stand-In County, Test Country',
+                        'address': {'city': 'Stand-In City', 'state': 'Stand-In County', 'country': 'Test Country'}
+                    }
+                else:
+                    self.send_error(404)
+                    return
+
+                self._send_json(200, body)
+
+            def _send_json(self, status, body):
+                payload = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass  # Keep benchmark output readable
+
+        return StandInHandler
+
+    def start(self):
+        """Serve requests on a background thread"""
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Shut the server down"""
+        self.server.shutdown()
+        self.server.server_close()
+
+def benchmark_transport(transport, request_count=200):
+    """Send geocoding requests through a transport and return requests per second"""
+    params = {'q': 'Benchmark City', 'format': 'json', 'limit': 1, 'addressdetails': 1}
+
+    start = time.perf_counter()
+    for _ in range(request_count):
+        response = transport.get('search', params, timeout=5)
+        response.json()
+    elapsed = time.perf_counter() - start
+
+    return request_count / elapsed
+
+# Demonstrate pooled vs. unpooled throughput against the local stand-in
+print("\nConnection Pooling Benchmark (offline):")
+print("=" * 45)
+
+stand_in = LocalNominatimStandIn().start()
+
+pooled_transport = NominatimTransport(base_url=stand_in.base_url, pooled=True)
+unpooled_transport = NominatimTransport(base_url=stand_in.base_url, pooled=False)
+
+pooled_rate = benchmark_transport(pooled_transport)
+unpooled_rate = benchmark_transport(unpooled_transport)
+
+print(f"Pooled (keep-alive):   {pooled_rate:8.1f} requests/sec")
+print(f"Unpooled (new socket): {unpooled_rate:8.1f} requests/sec")
+print(f"Speedup: {pooled_rate / unpooled_rate:.1f}x")
+
+# The same stand-in can be injected into any location class
+offline_geocoder = SimpleGeocoder(transport=pooled_transport)
+result = offline_geocoder.geocode_location("Springfield")
+if result:
+    print(f"Offline geocoder result: {result['display_name']}")
+
+pooled_transport.close()
+stand_in.stop()
@@ -0,0 +1,161 @@
+## Geocoding Many Locations Concurrently with asyncio:
+import asyncio
+
+class AsyncGeocoder:
+    """
+    Batch geocoding with bounded concurrency
+
+    By default requests go through the geocoder's transport, which for a plain
+    SimpleGeocoder() is the process-wide one from get_shared_transport(). Its
+    scheduler allows 1 request/s (the Nominatim usage policy), so batches against
+    the public service run at that rate whatever max_concurrency is. Pass a
+    transport with its own scheduler (or none, for a self-hosted server) to
+    actually run requests in parallel.
+    """
+
+    log = logging.getLogger('weather_locations.async_geocoder')
+
+    def __init__(self, geocoder=None, max_concurrency=4, priority=PRIORITY_BACKGROUND, transport=None):
+        """
+        Args:
+            geocoder: SimpleGeocoder whose parsing rules (and, by default, transport) are reused
+            max_concurrency: Maximum number of requests in flight at once
+            priority: Scheduler priority for batch requests (background by default)
+            transport: NominatimTransport for batch requests; defaults to the geocoder's
+        """
+        self.geocoder = geocoder or SimpleGeocoder(transport=transport)
+        self.transport = transport or self.geocoder.transport
+        self.validator = LocationValidator()
+        self.max_concurrency = max_concurrency
+        self.priority = priority
+
+        scheduler = self.transport.scheduler
+        if scheduler is not None and scheduler.requests_per_second < max_concurrency:
+            self.log.warning("Batch requests are limited to %g/s by the transport's scheduler, "
+                             "below max_concurrency=%d", scheduler.requests_per_second, max_concurrency)
+
+    async def geocode_many(self, location_names):
+        """
+        Geocode a list of location names concurrently
+
+        Returns:
+            List in the same order as the input. Each item is a dict with
+            'query', 'success' and either 'location_data' (the same dict
+            geocode_location returns) or 'error'.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = [self._bounded(semaphore, self._geocode_one(name)) for name in location_names]
+        return await asyncio.gather(*tasks)
+
+    async def reverse_many(self, coordinates):
+        """
+        Reverse geocode a list of (latitude, longitude) pairs concurrently
+
+        Returns:
+            List in the same order as the input, shaped like geocode_many results
+            with 'location_data' matching reverse_geocode
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = [self._bounded(semaphore, self._reverse_one(lat, lon)) for lat, lon in coordinates]
+        return await asyncio.gather(*tasks)
+
+    async def _bounded(self, semaphore, coroutine):
+        """Run a coroutine once a concurrency slot is free"""
+        async with semaphore:
+            return await coroutine
+
+    async def _geocode_one(self, location_name):
+        """Geocode a single name and wrap the outcome as a per-item result"""
+        params = self.geocoder._search_params(location_name)
+
+        try:
+            # The blocking transport call runs in a worker thread so requests overlap
+            response = await asyncio.to_thread(self.transport.get, 'search', params, 10, self.priority)
+
+            if response.status_code != 200:
+                return self._error(location_name, f"API error: {response.status_code}")
+
+            results = response.json()
+            if not results:
+                return self._error(location_name, f"No results found for '{location_name}'")
+
+            return {
+                'query': location_name,
+                'success': True,
+                'location_data': self.geocoder._parse_search_result(results[0])
+            }
+
+        except requests.exceptions.RequestException as e:
+            return self._error(location_name, f"Network error: {e}")
+        except Exception as e:
+            return self._error(location_name, f"Unexpected error: {e}")
+
+    async def _reverse_one(self, latitude, longitude):
+        """Reverse geocode a single coordinate pair as a per-item result"""
+        query = (latitude, longitude)
+
+        is_valid, message = self.validator.validate_coordinates(latitude, longitude)
+        if not is_valid:
+            return self._error(query, message)
+
+        params = self.geocoder._reverse_params(latitude, longitude)
+
+        try:
+            response = await asyncio.to_thread(self.transport.get, 'reverse', params, 10, self.priority)
+
+            if response.status_code != 200:
+                return self._error(query, f"API error: {response.status_code}")
+
+            result = response.json()
+            if 'display_name' not in result:
+                return self._error(query, f"No place found at {query}")
+
+            return {
+                'query': query,
+                'success': True,
+                'location_data': self.geocoder._parse_reverse_result(result)
+            }
+
+        except requests.exceptions.RequestException as e:
+            return self._error(query, f"Network error: {e}")
+        except Exception as e:
+            return self._error(query, f"Unexpected error: {e}")
+
+    def _error(self, query, message):
+        """Build a failed per-item result"""
+        return {'query': query, 'success': False, 'error': message}
+
+# Demonstrate batch geocoding against a slow local stand-in
+print("\nAsync Batch Geocoding Demonstration:")
+print("=" * 45)
+
+slow_stand_in = LocalNominatimStandIn(latency=0.05).start()
+slow_transport = NominatimTransport(base_url=slow_stand_in.base_url)
+
+batch_names = [f"Test City {i}" for i in range(12)]
+
+# Sequential baseline: one round-trip after another
+sequential_geocoder = SimpleGeocoder(transport=slow_transport)
+start = time.perf_counter()
+for name in batch_names:
+    slow_transport.get('search', sequential_geocoder._search_params(name), timeout=5)
+sequential_time = time.perf_counter() - start
+
+# Concurrent batch: about one round-trip per concurrency window
+async_geocoder = AsyncGeocoder(max_concurrency=6, transport=slow_transport)
+start = time.perf_counter()
+batch_results = asyncio.run(async_geocoder.geocode_many(batch_names))
+async_time = time.perf_counter() - start
+
+print(f"Sequential: {len(batch_names)} lookups in {sequential_time:.2f}s")
+print(f"Async (6 at a time): {len(batch_names)} lookups in {async_time:.2f}s")
+
+reverse_results = asyncio.run(async_geocoder.reverse_many([(40.7128, -74.0060), (91, 0)]))
+for item in batch_results[:2] + reverse_results:
+    if item['success']:
+        print(f"✓ {item['query']} → {item['location_data']['display_name']}")
+    else:
+        print(f"✗ {item['query']} → {item['error']}")
+
+slow_transport.close()
+slow_stand_in.stop()
@@ -0,0 +1,54 @@
+## Prioritizing Requests Under a Shared Rate Limit:
+
+def run_scheduler_demo(scheduler, workload):
+    """Send a burst of (label, priority) requests at once and return the order they were served"""
+    served = []
+    served_lock = threading.Lock()
+
+    def send(label, priority):
+        scheduler.acquire(priority)
+        with served_lock:
+            served.append(label)
+
+    threads = [threading.Thread(target=send, args=(label, priority)) for label, priority in workload]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.01)  # Make arrival order deterministic for the demonstration
+    for thread in threads:
+        thread.join()
+
+    return served
+
+print("\nRequest Scheduler Demonstration:")
+print("=" * 45)
+
+# A tighter-than-usual budget so the queue builds up quickly
+demo_scheduler = RequestScheduler(requests_per_second=10.0, burst=1)
+
+# Background prefetches arrive first, then keystrokes, then a real geocode
+demo_workload = (
+    [(f"prefetch-{i}", PRIORITY_BACKGROUND) for i in range(4)] +
+    [(f"autocomplete-{i}", PRIORITY_AUTOCOMPLETE) for i in range(3)] +
+    [("geocode-Chicago", PRIORITY_INTERACTIVE)]
+)
+
+served_order = run_scheduler_demo(demo_scheduler, demo_workload)
+print("Arrival order: " + ", ".join(label for label, _ in demo_workload))
+print("Served order:  " + ", ".join(served_order))
+
+stats = demo_scheduler.get_stats()
+print(f"\nRequests sent: {stats['requests']}")
+print(f"Max queue depth: {stats['max_queue_depth']}")
+print(f"Average wait: {stats['average_wait'] * 1000:.0f} ms (max {stats['max_wait'] * 1000:.0f} ms)")
+priority_names = {
+    PRIORITY_INTERACTIVE: 'interactive',
+    PRIORITY_AUTOCOMPLETE: 'autocomplete',
+    PRIORITY_BACKGROUND: 'background'
+}
+for priority, average_wait in stats['average_wait_by_priority'].items():
+    print(f"  {priority_names[priority]:<12} average wait: {average_wait * 1000:.0f} ms")
+
+# The shared transport used by every location class reports the same numbers
+shared_stats = get_shared_transport().scheduler.get_stats()
+print(f"\nShared Nominatim scheduler: {shared_stats['requests']} requests, "
+      f"queue depth {shared_stats['queue_depth']}")
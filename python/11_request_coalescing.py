@@ -0,0 +1,40 @@
+## Surviving a Cache Stampede with Request Coalescing:
+
+def run_stampede(service_call, location, thread_count=50):
+    """Ask for the same location from many threads at once and count result sources"""
+    sources = {}
+    sources_lock = threading.Lock()
+    start_line = threading.Barrier(thread_count)
+
+    def worker():
+        start_line.wait()  # Release every thread at the same moment
+        result = service_call(location)
+        with sources_lock:
+            source = result.get('source', 'error')
+            sources[source] = sources.get(source, 0) + 1
+
+    threads = [threading.Thread(target=worker) for _ in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return sources
+
+print("\nRequest Coalescing Demonstration:")
+print("=" * 45)
+
+stampede_stand_in = LocalNominatimStandIn(latency=0.1).start()
+stampede_transport = NominatimTransport(base_url=stampede_stand_in.base_url)
+
+stampede_service = WeatherLocationService(geocoder=SimpleGeocoder(transport=stampede_transport))
+sources = run_stampede(stampede_service.process_location_request, "Springfield")
+
+print(f"\n50 concurrent requests for 'Springfield':")
+for source, count in sorted(sources.items()):
+    print(f"  {source}: {count}")
+print(f"Upstream requests sent: {stampede_transport.request_count}")
+print(f"Single-flight stats: {stampede_service.in_flight.stats}")
+
+stampede_transport.close()
+stampede_stand_in.stop()
@@ -0,0 +1,48 @@
+## Keeping Caches Bounded in Long-Running Processes:
+
+print("\nBounded Cache Demonstration:")
+print("=" * 45)
+
+evicted = []
+demo_cache = BoundedCache(
+    max_entries=3,
+    ttl=60,
+    on_evict=lambda key, value, reason: evicted.append(f"{key} ({reason})")
+)
+
+# Fill past capacity: the least recently used entry is evicted
+for city in ["chicago", "london", "tokyo"]:
+    demo_cache.put(city, {'display_name': city.title()})
+
+demo_cache.get("chicago")  # Touch Chicago so London becomes the oldest
+demo_cache.put("paris", {'display_name': 'Paris'})
+
+print(f"Cached keys (oldest first): {list(demo_cache.to_dict())}")
+
+# Per-entry TTL: this entry expires almost immediately
+demo_cache.put("sydney", {'display_name': 'Sydney'}, ttl=0.05)
+time.sleep(0.1)
+print(f"Sydney after its TTL: {demo_cache.get('sydney')}")
+
+demo_cache.get("atlantis")  # A plain miss
+
+print(f"Evicted: {', '.join(evicted)}")
+print(f"Stats: {demo_cache.get_stats()}")
+
+# Byte limits keep large values from crowding out memory
+byte_cache = BoundedCache(max_entries=1000, max_bytes=4096)
+for i in range(100):
+    byte_cache.put(f"city-{i}", {'display_name': f"City {i}", 'latitude': 40.0, 'longitude': -74.0})
+stats = byte_cache.get_stats()
+print(f"\nByte-limited cache kept {stats['entries']} of 100 entries ({stats['bytes']} bytes)")
+
+# Entries saved to disk keep their age: a restart does not give them a fresh TTL
+saved_entries, saved_times = demo_cache.to_dict(), demo_cache.stored_times()
+saved_times['paris'] -= 90  # As if Paris had been cached 90 s before the save
+restarted_cache = BoundedCache(max_entries=3, ttl=60)
+restarted_cache.update(saved_entries, saved_times)
+print(f"\nSaved: {list(saved_entries)}, after a restart: {list(restarted_cache.to_dict())} "
+      f"(Paris was past its 60 s TTL)")
+
+# The location services use the same cache class
+print(f"Location service cache: {location_service.location_cache.get_stats()}")
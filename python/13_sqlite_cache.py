@@ -0,0 +1,229 @@
+## Sharing a Persistent Geocode Cache Across Processes:
+import atexit
+import sqlite3
+import tempfile
+import weakref
+
+def _flush_at_exit(cache_ref):
+    """atexit hook: write what an unclosed cache still holds (the weak reference lets it be collected)"""
+    cache = cache_ref()
+    if cache is not None:
+        cache.flush()
+
+class SQLiteGeocodeCache:
+    """On-disk cache backend in SQLite (WAL mode) that many processes can share"""
+
+    def __init__(self, db_path="geocode_cache.db", namespace="geocode", max_age=None,
+                 batch_size=50, flush_interval=2.0):
+        """
+        Args:
+            db_path: SQLite database file shared by all workers
+            namespace: Keeps different caches (geocode, autocomplete, ...) apart in one file
+            max_age: Ignore entries older than this many seconds, or None to keep forever
+            batch_size: Number of pending writes that triggers a flush
+            flush_interval: Seconds a write may wait before it is flushed in the background
+        """
+        self.db_path = db_path
+        self.namespace = namespace
+        self.max_age = max_age
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.local = threading.local()  # One connection per thread
+        self.pending = {}  # key -> (value, stored_at) writes waiting for the next batch
+        self.pending_lock = threading.Lock()
+        self.timer = None
+        self.stats = {'reads': 0, 'read_hits': 0, 'writes': 0, 'flushes': 0}
+        self.stats_lock = threading.Lock()  # One backend serves every thread of its BoundedCache
+
+        self._create_schema()
+        # Nothing in BoundedCache closes its backend, so the last batch is also written at exit
+        atexit.register(_flush_at_exit, weakref.ref(self))
+
+    def _connection(self):
+        """Return this thread's connection, opening it on first use"""
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=10)
+            connection.execute("PRAGMA journal_mode=WAL")  # Readers never block the writer
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.local.connection = connection
+        return connection
+
+    def _create_schema(self):
+        """Create the cache table; the primary key doubles as the lookup index"""
+        connection = self._connection()
+        with connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS geocode_cache (
+                    namespace TEXT NOT NULL,
+                    cache_key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, cache_key)
+                ) WITHOUT ROWID
+            """)
+            connection.execute("""
+                CREATE INDEX IF NOT EXISTS geocode_cache_recent
+                ON geocode_cache (namespace, updated_at)
+            """)
+
+    def get(self, key):
+        """Look up one entry, or return None"""
+        entry = self.get_entry(key)
+        return None if entry is None else entry[0]
+
+    def get_entry(self, key):
+        """
+        Look up one entry with its age
+
+        Returns:
+            (value, stored_at) with stored_at in wall-clock seconds, or None;
+            BoundedCache counts its TTL from stored_at
+        """
+        with self.pending_lock:
+            if key in self.pending:
+                return self.pending[key]
+
+        row = self._connection().execute(
+            "SELECT value, updated_at FROM geocode_cache WHERE namespace = ? AND cache_key = ?",
+            (self.namespace, key)
+        ).fetchone()
+        hit = row is not None and not self._is_stale(row[1])
+
+        with self.stats_lock:
+            self.stats['reads'] += 1
+            if hit:
+                self.stats['read_hits'] += 1
+        return (json.loads(row[0]), row[1]) if hit else None
+
+    def put(self, key, value, stored_at=None):
+        """
+        Queue a write; it is committed with the next batch
+
+        Args:
+            stored_at: Wall-clock time the value was first cached (now if None)
+        """
+        with self.pending_lock:
+            self.pending[key] = (value, time.time() if stored_at is None else stored_at)
+            should_flush = len(self.pending) >= self.batch_size
+
+            if not should_flush and self.timer is None:
+                # An idle worker's last writes still reach the other processes soon
+                self.timer = threading.Timer(self.flush_interval, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+        if should_flush:
+            self.flush()
+
+    def flush(self):
+        """Write all pending entries in a single transaction"""
+        with self.pending_lock:
+            batch, self.pending = self.pending, {}
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+
+        if not batch:
+            return 0
+
+        connection = self._connection()
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO geocode_cache (namespace, cache_key, value, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                [(self.namespace, key, json.dumps(value, default=json_default), stored_at)
+                 for key, (value, stored_at) in batch.items()]
+            )
+
+        with self.stats_lock:
+            self.stats['writes'] += len(batch)
+            self.stats['flushes'] += 1
+        return len(batch)
+
+    def load_recent(self, limit):
+        """Return up to limit of the most recently written entries as (value, stored_at), oldest first"""
+        self.flush()
+        rows = self._connection().execute(
+            "SELECT cache_key, value, updated_at FROM geocode_cache "
+            "WHERE namespace = ? ORDER BY updated_at DESC LIMIT ?",
+            (self.namespace, limit)
+        ).fetchall()
+
+        return {key: (json.loads(value), updated_at) for key, value, updated_at in reversed(rows)
+                if not self._is_stale(updated_at)}
+
+    def clear(self):
+        """Delete every entry in this namespace, pending writes included"""
+        with self.pending_lock:
+            self.pending = {}
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM geocode_cache WHERE namespace = ?", (self.namespace,))
+
+    def _is_stale(self, updated_at):
+        return self.max_age is not None and time.time() - updated_at > self.max_age
+
+    def __len__(self):
+        self.flush()
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM geocode_cache WHERE namespace = ?", (self.namespace,)
+        ).fetchone()[0]
+
+    def close(self):
+        """Flush pending writes and close this thread's connection"""
+        self.flush()
+        connection = getattr(self.local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self.local.connection = None
+
+# Demonstrate a warm start for a second worker
+print("\nPersistent Geocode Cache Demonstration:")
+print("=" * 45)
+
+cache_dir = tempfile.mkdtemp()
+shared_db_path = os.path.join(cache_dir, "geocode_cache.db")
+
+sqlite_stand_in = LocalNominatimStandIn().start()
+sqlite_transport = NominatimTransport(base_url=sqlite_stand_in.base_url)
+
+# Worker 1 geocodes a few cities and writes them to the shared database
+first_worker = WeatherLocationService(
+    geocoder=SimpleGeocoder(transport=sqlite_transport),
+    cache_backend=SQLiteGeocodeCache(shared_db_path, namespace="weather_service")
+)
+for city in ["Springfield", "Riverside", "Franklin"]:
+    first_worker.process_location_request(city)
+first_worker.location_cache.backend.close()
+
+requests_before = sqlite_transport.request_count
+
+# Worker 2 starts fresh but loads the shared cache instead of re-geocoding
+second_worker = WeatherLocationService(
+    geocoder=SimpleGeocoder(transport=sqlite_transport),
+    cache_backend=SQLiteGeocodeCache(shared_db_path, namespace="weather_service")
+)
+for city in ["Springfield", "Riverside", "Franklin"]:
+    result = second_worker.process_location_request(city)
+
+print(f"\nWorker 1 upstream requests: {requests_before}")
+print(f"Worker 2 upstream requests: {sqlite_transport.request_count - requests_before}")
+print(f"Entries in shared cache: {len(second_worker.location_cache.backend)}")
+
+second_worker.location_cache.backend.close()
+
+# An idle worker's last write is flushed by its timer, without close() or another put
+idle_backend = SQLiteGeocodeCache(shared_db_path, namespace="idle_worker", flush_interval=0.1)
+idle_backend.put("salem", {'display_name': "Salem", 'latitude': 42.52, 'longitude': -70.90, 'type': 'city'})
+time.sleep(0.3)
+other_process_view = SQLiteGeocodeCache(shared_db_path, namespace="idle_worker")
+print(f"Idle worker's write visible to others: {other_process_view.get('salem') is not None}")
+other_process_view.close()
+sqlite_transport.close()
+sqlite_stand_in.stop()
@@ -0,0 +1,255 @@
+## Answering Common Lookups from a Local Gazetteer:
+import math
+import mmap
+import struct
+
+# GeoNames dump columns we read (the file has 19 tab-separated columns)
+GEONAMES_NAME = 1
+GEONAMES_ASCII_NAME = 2
+GEONAMES_LATITUDE = 4
+GEONAMES_LONGITUDE = 5
+GEONAMES_FEATURE_CODE = 7
+GEONAMES_COUNTRY_CODE = 8
+GEONAMES_ADMIN1_CODE = 10
+GEONAMES_POPULATION = 14
+
+class LocalGazetteerGeocoder:
+    """Geocoder backed by a memory-mapped name index over a GeoNames-style TSV file"""
+
+    INDEX_MAGIC = b'GZIDX001'
+    HEADER = struct.Struct('<8sI')   # magic, number of index slots
+    SLOT = struct.Struct('<QII')     # line offset in TSV, key offset in key blob, key length
+
+    def __init__(self, gazetteer_path, index_path=None, fallback=None):
+        """
+        Args:
+            gazetteer_path: GeoNames-style TSV dump (e.g. cities15000.txt)
+            index_path: Where to keep the sorted name index (built on first use)
+            fallback: Remote geocoder (such as SimpleGeocoder) used only on a local miss
+        """
+        self.gazetteer_path = gazetteer_path
+        self.index_path = index_path or gazetteer_path + '.idx'
+        self.fallback = fallback
+        self.stats = {'local_hits': 0, 'fallback_lookups': 0, 'misses': 0}
+
+        if self._index_is_stale():
+            self.build_index(self.gazetteer_path, self.index_path)
+
+        # Startup only maps the files; nothing is parsed until a lookup needs it
+        self.gazetteer_file = open(self.gazetteer_path, 'rb')
+        self.gazetteer = mmap.mmap(self.gazetteer_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.index_file = open(self.index_path, 'rb')
+        self.index = mmap.mmap(self.index_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.slot_count = self.HEADER.unpack_from(self.index, 0)
+        if magic != self.INDEX_MAGIC:
+            raise ValueError(f"{self.index_path} is not a gazetteer index")
+        self.keys_start = self.HEADER.size + self.slot_count * self.SLOT.size
+
+    def _index_is_stale(self):
+        return not os.path.exists(self.index_path) or \
+            os.path.getmtime(self.index_path) < os.path.getmtime(self.gazetteer_path)
+
+    @classmethod
+    def build_index(cls, gazetteer_path, index_path):
+        """Write a sorted (name key → line offset) index for a gazetteer file"""
+        entries = []
+        offset = 0
+
+        with open(gazetteer_path, 'rb') as f:
+            for line in f:
+                if not line.startswith(b'#'):
+                    fields = line.split(b'\t', GEONAMES_ASCII_NAME + 1)
+                    if len(fields) > GEONAMES_ASCII_NAME:
+                        names = {fields[GEONAMES_NAME], fields[GEONAMES_ASCII_NAME]}
+                        for name in names:
+                            key = cls._name_key(name.decode('utf-8')).encode('utf-8')
+                            entries.append((key, offset))
+                offset += len(line)
+
+        # UTF-8 byte order matches code point order, so sorted bytes can be binary searched
+        entries.sort()
+
+        key_blob = bytearray()
+        slots = bytearray()
+        for key, line_offset in entries:
+            slots += cls.SLOT.pack(line_offset, len(key_blob), len(key))
+            key_blob += key
+
+        temp_path = index_path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(cls.HEADER.pack(cls.INDEX_MAGIC, len(entries)))
+            f.write(slots)
+            f.write(key_blob)
+        os.replace(temp_path, index_path)
+
+    @staticmethod
+    def _name_key(name):
+        """Normalize a place name for case-insensitive lookups"""
+        return ' '.join(name.split()).casefold()
+
+    def _key_at(self, slot_number):
+        """Read the index key stored in a slot"""
+        _, key_offset, key_length = self.SLOT.unpack_from(self.index, self.HEADER.size + slot_number * self.SLOT.size)
+        start = self.keys_start + key_offset
+        return self.index[start:start + key_length]
+
+    def _find_offsets(self, name):
+        """Binary search the index and return TSV line offsets for every match"""
+        key = self._name_key(name).encode('utf-8')
+
+        low, high = 0, self.slot_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        offsets = []
+        slot_number = low
+        while slot_number < self.slot_count and self._key_at(slot_number) == key:
+            line_offset, _, _ = self.SLOT.unpack_from(self.index, self.HEADER.size + slot_number * self.SLOT.size)
+            offsets.append(line_offset)
+            slot_number += 1
+        return offsets
+
+    def _read_record(self, line_offset):
+        """Parse one gazetteer line straight from the memory map"""
+        line_end = self.gazetteer.find(b'\n', line_offset)
+        if line_end == -1:
+            line_end = len(self.gazetteer)
+        fields = self.gazetteer[line_offset:line_end].decode('utf-8').split('\t')
+
+        population = int(fields[GEONAMES_POPULATION] or 0)
+        return {
+            'name': fields[GEONAMES_NAME],
+            'latitude': float(fields[GEONAMES_LATITUDE]),
+            'longitude': float(fields[GEONAMES_LONGITUDE]),
+            'feature_code': fields[GEONAMES_FEATURE_CODE],
+            'country_code': fields[GEONAMES_COUNTRY_CODE],
+            'admin1_code': fields[GEONAMES_ADMIN1_CODE],
+            'population': population
+        }
+
+    def lookup(self, location_name):
+        """
+        Find gazetteer records for a name such as "Paris" or "Paris, TX"
+
+        Returns:
+            Matching records, best first: exact-case name matches, then records whose
+            state/country code matches the qualifier, then by population
+        """
+        name, _, qualifier = location_name.partition(',')
+        name = name.strip()
+        qualifier = qualifier.strip().upper()
+
+        records = [self._read_record(offset) for offset in set(self._find_offsets(name))]
+        records.sort(key=lambda record: (
+            record['name'] != name,
+            bool(qualifier) and qualifier not in (record['admin1_code'], record['country_code']),
+            -record['population']
+        ))
+        return records
+
+    def geocode_location(self, location_name):
+        """Same interface as SimpleGeocoder.geocode_location, answered locally when possible"""
+        records = self.lookup(location_name)
+
+        if records:
+            self.stats['local_hits'] += 1
+            return self._to_location_data(records[0])
+
+        if self.fallback:
+            self.stats['fallback_lookups'] += 1
+            return self.fallback.geocode_location(location_name)
+
+        self.stats['misses'] += 1
+        return None
+
+    def search_location(self, location_name):
+        """Same as geocode_location, but a failed fallback lookup raises GeocodingUnavailable"""
+        records = self.lookup(location_name)
+
+        if records:
+            self.stats['local_hits'] += 1
+            return self._to_location_data(records[0])
+
+        if self.fallback:
+            self.stats['fallback_lookups'] += 1
+            return self.fallback.search_location(location_name)
+
+        self.stats['misses'] += 1
+        return None
+
+    def reverse_geocode(self, latitude, longitude):
+        """Reverse geocoding is delegated to the fallback geocoder"""
+        if self.fallback:
+            return self.fallback.reverse_geocode(latitude, longitude)
+        return None
+
+    def _to_location_data(self, record):
+        """Shape a gazetteer record like a geocode_location result"""
+        display_parts = [record['name'], record['admin1_code'], record['country_code']]
+        return {
+            'latitude': record['latitude'],
+            'longitude': record['longitude'],
+            'display_name': ', '.join(part for part in display_parts if part),
+            'type': 'city',
+            # Nominatim importance is 0..1; population on a log scale is a close stand-in
+            'importance': min(1.0, math.log10(record['population'] + 1) / 8)
+        }
+
+    def iter_places(self):
+        """Yield every gazetteer record (used to build other local indexes)"""
+        line_offset = 0
+        while line_offset < len(self.gazetteer):
+            line_end = self.gazetteer.find(b'\n', line_offset)
+            if line_end == -1:
+                line_end = len(self.gazetteer)
+            if self.gazetteer[line_offset:line_offset + 1] != b'#' and line_end > line_offset:
+                yield self._read_record(line_offset)
+            line_offset = line_end + 1
+
+    def close(self):
+        """Release the memory maps"""
+        self.gazetteer.close()
+        self.gazetteer_file.close()
+        self.index.close()
+        self.index_file.close()
+
+# Demonstrate local lookups with a remote fallback
+print("\nLocal Gazetteer Demonstration:")
+print("=" * 45)
+
+# Next to the lesson files, wherever the demo is started from
+sample_gazetteer_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "sample_cities.txt")
+gazetteer_index_path = os.path.join(tempfile.mkdtemp(), "sample_cities.idx")
+
+gazetteer_stand_in = LocalNominatimStandIn().start()
+gazetteer_transport = NominatimTransport(base_url=gazetteer_stand_in.base_url)
+
+local_geocoder = LocalGazetteerGeocoder(
+    sample_gazetteer_path,
+    index_path=gazetteer_index_path,
+    fallback=SimpleGeocoder(transport=gazetteer_transport)
+)
+
+for location in ["London", "london, ca", "Paris, TX", "springfield, MO", "Smallville"]:
+    result = local_geocoder.geocode_location(location)
+    if result:
+        print(f"{location}: {result['display_name']} ({result['latitude']:.4f}, {result['longitude']:.4f})")
+
+# Time a batch of local lookups
+lookups = 10000
+start = time.perf_counter()
+for _ in range(lookups):
+    local_geocoder.geocode_location("Chicago")
+elapsed = time.perf_counter() - start
+print(f"\nLocal lookup time: {elapsed / lookups * 1_000_000:.1f} µs per lookup")
+print(f"Stats: {local_geocoder.stats}")
+print(f"Upstream requests: {gazetteer_transport.request_count}")
+
+local_geocoder.close()
+gazetteer_transport.close()
+gazetteer_stand_in.stop()
@@ -0,0 +1,343 @@
+## Reverse Geocoding Locally with a Spatial Index:
+import random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # Distances fall back to plain Python math
+
+GEOHASH_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+EARTH_RADIUS_KM = 6371.0
+
+def encode_geohash(latitude, longitude, precision=6):
+    """Encode coordinates as a geohash string (each character narrows the cell 32x)"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    geohash = []
+    bits = 0
+    bit_count = 0
+    use_longitude = True
+
+    while len(geohash) < precision:
+        value_range, value = (lon_range, longitude) if use_longitude else (lat_range, latitude)
+        middle = (value_range[0] + value_range[1]) / 2
+
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            value_range[0] = middle
+        else:
+            value_range[1] = middle
+
+        use_longitude = not use_longitude
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(GEOHASH_BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return ''.join(geohash)
+
+def geohash_cell_size(precision):
+    """Height and width of a geohash cell in degrees"""
+    total_bits = precision * 5
+    lon_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lon_bits)
+
+def haversine_km(latitude, longitude, latitudes, longitudes):
+    """Great-circle distances from one point to many (NumPy arrays or lists of degrees)"""
+    if np is not None:
+        lat1, lon1 = np.radians(latitude), np.radians(longitude)
+        lat2, lon2 = np.radians(latitudes), np.radians(longitudes)
+        a = np.sin((lat2 - lat1) / 2) ** 2 + \
+            np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+    lat1, lon1 = math.radians(latitude), math.radians(longitude)
+    distances = []
+    for lat2, lon2 in zip(latitudes, longitudes):
+        lat2, lon2 = math.radians(lat2), math.radians(lon2)
+        a = math.sin((lat2 - lat1) / 2) ** 2 + \
+            math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+        distances.append(2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0))))
+    return distances
+
+class SpatialReverseGeocoder:
+    """Nearest-place reverse geocoding from a geohash-bucketed index of known places"""
+
+    def __init__(self, precision=4, max_distance_km=50, fallback=None):
+        """
+        Args:
+            precision: Geohash length used for buckets (4 ≈ 20-40 km cells)
+            max_distance_km: Farther than this, the nearest place doesn't count as a match
+            fallback: Remote geocoder used when no known place is close enough
+        """
+        self.precision = precision
+        self.max_distance_km = max_distance_km
+        self.fallback = fallback
+
+        self.latitudes = []
+        self.longitudes = []
+        self.places = []  # Place dicts shaped like reverse_geocode results
+        self.buckets = {}  # geohash cell as (row, column) -> list of place numbers
+        self.arrays = None  # NumPy copies, rebuilt after new places are added
+
+        self.cell_height, self.cell_width = geohash_cell_size(precision)
+        self.row_count = round(180.0 / self.cell_height)
+        self.column_count = round(360.0 / self.cell_width)
+
+        self.stats = {'local_hits': 0, 'fallback_lookups': 0, 'ring_expansions': 0}
+
+    def add_place(self, latitude, longitude, place):
+        """Index one place (a dict with display_name, city, state and country)"""
+        place_number = len(self.places)
+        self.latitudes.append(latitude)
+        self.longitudes.append(longitude)
+        self.places.append(place)
+        self.buckets.setdefault(self._cell(latitude, longitude), []).append(place_number)
+        self.arrays = None
+
+    def add_gazetteer(self, gazetteer):
+        """Index every place in a LocalGazetteerGeocoder"""
+        for record in gazetteer.iter_places():
+            display_parts = [record['name'], record['admin1_code'], record['country_code']]
+            self.add_place(record['latitude'], record['longitude'], {
+                'display_name': ', '.join(part for part in display_parts if part),
+                'city': record['name'],
+                'state': record['admin1_code'],
+                'country': record['country_code']
+            })
+
+    def add_cached_locations(self, location_cache):
+        """Index locations already geocoded into a location cache (a BoundedCache or a plain dict)"""
+        if isinstance(location_cache, BoundedCache):
+            location_cache = location_cache.to_dict()
+        for location in location_cache.values():
+            parts = [part.strip() for part in location['display_name'].split(',')]
+            self.add_place(location['latitude'], location['longitude'], {
+                'display_name': location['display_name'],
+                'city': parts[0],
+                'state': parts[-2] if len(parts) >= 3 else '',
+                'country': parts[-1] if len(parts) >= 2 else ''
+            })
+
+    def _get_arrays(self):
+        """Latitude/longitude columns for vectorized distance math"""
+        if self.arrays is None:
+            if np is not None:
+                self.arrays = (np.array(self.latitudes), np.array(self.longitudes))
+            else:
+                self.arrays = (self.latitudes, self.longitudes)
+        return self.arrays
+
+    def _distances(self, latitude, longitude, place_numbers):
+        """
+        Distances from a query to the given places
+
+        With NumPy, latitude and longitude may also be (n, 1) columns of queries,
+        giving an (n, len(place_numbers)) matrix from one haversine_km() call.
+        """
+        latitudes, longitudes = self._get_arrays()
+        if np is not None:
+            place_array = np.array(place_numbers)
+            return haversine_km(latitude, longitude, latitudes[place_array], longitudes[place_array])
+        return haversine_km(latitude, longitude,
+                            [latitudes[i] for i in place_numbers],
+                            [longitudes[i] for i in place_numbers])
+
+    def _cell(self, latitude, longitude):
+        """
+        (row, column) of the geohash cell holding a point
+
+        These are the cells encode_geohash() names at this precision; numbering them
+        lets a search step to neighbouring cells by index instead of re-encoding.
+        """
+        row = min(max(int((latitude + 90.0) / self.cell_height), 0), self.row_count - 1)
+        column = int((longitude + 180.0) / self.cell_width) % self.column_count
+        return row, column
+
+    def _block(self, latitude, row, column, rings):
+        """
+        Rows and columns of the cells around a query's cell that hold every place within `rings` cell heights
+
+        Rows step one cell height at a time. A degree of longitude shrinks with
+        cos(latitude), so the block takes as many columns as that distance spans
+        at the query's latitude, which near the poles is every column.
+        """
+        rows = range(max(0, row - rings), min(self.row_count, row + rings + 1))
+
+        radius = math.radians(rings * self.cell_height)
+        reach = math.sin(radius) / math.cos(math.radians(min(abs(latitude), 90.0))) if radius < math.pi / 2 else 1.0
+        if reach >= 1.0:
+            return rows, range(self.column_count)
+
+        column_steps = math.ceil(math.degrees(math.asin(reach)) / self.cell_width)
+        if 2 * column_steps + 1 >= self.column_count:
+            return rows, range(self.column_count)
+        return rows, [(column + step) % self.column_count for step in range(-column_steps, column_steps + 1)]
+
+    def _safe_radius_km(self, rings):
+        """Distance within which a `rings` block is guaranteed to hold every place"""
+        return math.radians(min(rings * self.cell_height, 180.0)) * EARTH_RADIUS_KM
+
+    def _block_place_numbers(self, rows, columns, seen_cells):
+        """Place numbers in the block's cells that were not searched yet"""
+        if len(rows) * len(columns) > len(self.buckets):
+            # A block bigger than the index (e.g. near a pole): pick its cells out of the buckets instead
+            column_set = set(columns)
+            cells = [cell for cell in self.buckets if cell[0] in rows and cell[1] in column_set]
+        else:
+            cells = [(row, column) for row in rows for column in columns]
+
+        place_numbers = []
+        for cell in cells:
+            if cell not in seen_cells:
+                seen_cells.add(cell)
+                place_numbers.extend(self.buckets.get(cell, []))
+        return place_numbers
+
+    def nearest(self, latitude, longitude, max_distance_km=None):
+        """
+        Find the closest indexed place, widening the block of cells searched one ring at a time
+
+        Args:
+            max_distance_km: Stop once every place this close has been seen
+                             (the geocoder's max_distance_km if None, math.inf for no limit)
+
+        Returns:
+            (place_number, distance_km), or (None, None) if no place is within max_distance_km
+        """
+        if max_distance_km is None:
+            max_distance_km = self.max_distance_km
+
+        row, column = self._cell(latitude, longitude)
+        best_number, best_distance = None, math.inf
+        seen_cells = set()
+        places_seen = 0
+        rings = 1
+
+        while places_seen < len(self.places):
+            candidates = self._block_place_numbers(*self._block(latitude, row, column, rings), seen_cells)
+            places_seen += len(candidates)
+
+            if candidates:
+                distances = self._distances(latitude, longitude, candidates)
+                if np is not None:
+                    best = int(np.argmin(distances))
+                else:
+                    best = min(range(len(candidates)), key=distances.__getitem__)
+                if distances[best] < best_distance:
+                    best_number, best_distance = candidates[best], float(distances[best])
+
+            safe_radius = self._safe_radius_km(rings)
+            if best_distance <= safe_radius or safe_radius >= max_distance_km:
+                break  # Provably nearest, or nothing unseen could be close enough
+
+            rings += 1
+            self.stats['ring_expansions'] += 1
+
+        if best_distance > max_distance_km:
+            return None, None
+        return best_number, best_distance
+
+    def reverse_geocode(self, latitude, longitude):
+        """Same interface as SimpleGeocoder.reverse_geocode, answered from the index when possible"""
+        place_number, _ = self.nearest(float(latitude), float(longitude))
+        return self._result(place_number, latitude, longitude)
+
+    def _result(self, place_number, latitude, longitude):
+        """A copy of the indexed place, or the fallback's answer when none was close enough"""
+        if place_number is not None:
+            self.stats['local_hits'] += 1
+            return dict(self.places[place_number])
+
+        if self.fallback:
+            self.stats['fallback_lookups'] += 1
+            return self.fallback.reverse_geocode(latitude, longitude)
+
+        return None
+
+    def reverse_many(self, coordinates):
+        """
+        Reverse geocode many (latitude, longitude) pairs in one call
+
+        Points are grouped by geohash cell, and with NumPy each group's distances to
+        the places around its cell come from one haversine_km() call. Points whose
+        nearest place may lie outside that block go through nearest()'s wider search.
+        """
+        coordinates = [(float(latitude), float(longitude)) for latitude, longitude in coordinates]
+        if np is None or not self.places:
+            return [self.reverse_geocode(latitude, longitude) for latitude, longitude in coordinates]
+
+        groups = {}
+        for index, (latitude, longitude) in enumerate(coordinates):
+            groups.setdefault(self._cell(latitude, longitude), []).append(index)
+
+        safe_radius = self._safe_radius_km(1)
+        results = [None] * len(coordinates)
+        for (row, column), indexes in groups.items():
+            # One block serves the whole cell when sized for its edge farthest from the equator
+            edge_latitude = max(abs(row * self.cell_height - 90.0), abs((row + 1) * self.cell_height - 90.0))
+            candidates = self._block_place_numbers(*self._block(edge_latitude, row, column, 1), set())
+
+            if candidates:
+                group_latitudes = np.array([coordinates[i][0] for i in indexes])
+                group_longitudes = np.array([coordinates[i][1] for i in indexes])
+                distances = self._distances(group_latitudes[:, None], group_longitudes[:, None], candidates)
+                best = np.argmin(distances, axis=1)
+                best_distances = distances[np.arange(len(indexes)), best]
+
+            for position, index in enumerate(indexes):
+                latitude, longitude = coordinates[index]
+                if candidates and best_distances[position] <= safe_radius:
+                    close_enough = best_distances[position] <= self.max_distance_km
+                    place_number = candidates[best[position]] if close_enough else None
+                    results[index] = self._result(place_number, latitude, longitude)
+                else:
+                    results[index] = self.reverse_geocode(latitude, longitude)
+
+        return results
+
+# Demonstrate local reverse geocoding over the sample gazetteer
+print("\nSpatial Reverse Geocoding Demonstration:")
+print("=" * 45)
+
+spatial_gazetteer = LocalGazetteerGeocoder(sample_gazetteer_path, index_path=gazetteer_index_path)
+spatial_geocoder = SpatialReverseGeocoder(precision=4, max_distance_km=50)
+spatial_geocoder.add_gazetteer(spatial_gazetteer)
+
+# GPS readings a few hundred metres from city centres, plus one in the open ocean
+test_points = [
+    (40.7128, -74.0060),   # New York City
+    (51.5074, -0.1278),    # London
+    (35.6762, 139.6503),   # Tokyo
+    (41.88, -87.63),       # Chicago
+    (0.0, -140.0)          # Pacific Ocean
+]
+
+for (lat, lon), place in zip(test_points, spatial_geocoder.reverse_many(test_points)):
+    if place:
+        print(f"({lat}, {lon}) → {place['display_name']}")
+    else:
+        print(f"({lat}, {lon}) → No known place within {spatial_geocoder.max_distance_km} km")
+
+# Batch of jittery GPS readings around known cities
+random_points = [
+    (lat + random.uniform(-0.1, 0.1), lon + random.uniform(-0.1, 0.1))
+    for lat, lon in random.choices(test_points[:4], k=10000)
+]
+start = time.perf_counter()
+spatial_geocoder.reverse_many(random_points)
+elapsed = time.perf_counter() - start
+
+print(f"\n{len(random_points)} reverse lookups in {elapsed:.2f}s "
+      f"({elapsed / len(random_points) * 1_000_000:.0f} µs each, NumPy: {np is not None})")
+print(f"Stats: {spatial_geocoder.stats}")
+
+# Places the location service already geocoded can be indexed too
+indexed_before = len(spatial_geocoder.places)
+spatial_geocoder.add_cached_locations(location_service.location_cache)
+print(f"Indexed {len(spatial_geocoder.places) - indexed_before} places from the service's location cache")
+
+spatial_gazetteer.close()
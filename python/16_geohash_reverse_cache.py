@@ -0,0 +1,105 @@
+## Caching Reverse Lookups for Jittery GPS Coordinates:
+
+class GeohashReverseCache:
+    """Reverse-geocode cache keyed by geohash cell, so nearby GPS readings share one entry"""
+
+    def __init__(self, geocoder, precision=7, tracked_precisions=(5, 6, 7, 8),
+                 cache_size=10000, cache_ttl=24 * 60 * 60):
+        """
+        Args:
+            geocoder: Anything with reverse_geocode(latitude, longitude), e.g. SimpleGeocoder
+            precision: Geohash length used as the cache key (7 ≈ 150 m cells)
+            tracked_precisions: Precisions whose hit rate is estimated for tuning
+            cache_size: Maximum number of cached cells
+            cache_ttl: Seconds before a cached place is looked up again
+        """
+        self.geocoder = geocoder
+        self.precision = precision
+        self.tracked_precisions = sorted(set(tracked_precisions) | {precision})
+        self.cache = BoundedCache(max_entries=cache_size, ttl=cache_ttl)
+
+        # Remember which cells were seen at every tracked precision (values are just markers)
+        self.seen_cells = {p: BoundedCache(max_entries=cache_size) for p in self.tracked_precisions}
+        self.precision_stats = {p: {'lookups': 0, 'hits': 0} for p in self.tracked_precisions}
+        self.stats = {'lookups': 0, 'hits': 0, 'upstream_calls': 0}
+        self.stats_lock = threading.Lock()  # Guards both stats dicts; many threads share one cache
+
+    def reverse_geocode(self, latitude, longitude):
+        """Same interface as SimpleGeocoder.reverse_geocode, served from the cell cache when possible"""
+        # Encode once at the finest precision; shorter precisions are prefixes of it
+        geohash = encode_geohash(float(latitude), float(longitude), self.tracked_precisions[-1])
+        self._track_precisions(geohash)
+
+        cell = geohash[:self.precision]
+        cached_place = self.cache.get(cell)
+        with self.stats_lock:
+            self.stats['lookups'] += 1
+            self.stats['hits' if cached_place is not None else 'upstream_calls'] += 1
+
+        # Callers get copies, so changing a result can't change what the cache serves
+        if cached_place is not None:
+            return dict(cached_place)
+
+        place = self.geocoder.reverse_geocode(latitude, longitude)
+        if place:
+            self.cache.put(cell, place)
+            return dict(place)
+        return place
+
+    def _track_precisions(self, geohash):
+        """Record whether this point would have hit the cache at each tracked precision"""
+        with self.stats_lock:
+            for precision in self.tracked_precisions:
+                cell = geohash[:precision]
+                stats = self.precision_stats[precision]
+                stats['lookups'] += 1
+
+                if self.seen_cells[precision].get(cell):
+                    stats['hits'] += 1
+                else:
+                    self.seen_cells[precision].put(cell, True)
+
+    def hit_rate_by_precision(self):
+        """
+        Estimated hit rate and cell size for each tracked precision
+
+        Returns:
+            dict of precision -> {'hit_rate': 0..1, 'cell_size_m': approximate cell height}
+        """
+        report = {}
+        with self.stats_lock:
+            precision_stats = {precision: dict(stats) for precision, stats in self.precision_stats.items()}
+        for precision, stats in precision_stats.items():
+            cell_height, _ = geohash_cell_size(precision)
+            report[precision] = {
+                'hit_rate': stats['hits'] / stats['lookups'] if stats['lookups'] else 0.0,
+                'cell_size_m': cell_height * 111_320  # Metres per degree of latitude
+            }
+        return report
+
+# Demonstrate caching for jittery GPS readings
+print("\nGeohash Reverse Cache Demonstration:")
+print("=" * 45)
+
+gps_stand_in = LocalNominatimStandIn().start()
+gps_transport = NominatimTransport(base_url=gps_stand_in.base_url)
+
+reverse_cache = GeohashReverseCache(SimpleGeocoder(transport=gps_transport), precision=7)
+
+# 500 readings from 5 devices, each wandering a few metres around a fixed spot
+device_locations = [(40.7128, -74.0060), (51.5074, -0.1278), (35.6762, 139.6503),
+                    (41.8781, -87.6298), (48.8566, 2.3522)]
+for _ in range(500):
+    lat, lon = random.choice(device_locations)
+    reverse_cache.reverse_geocode(lat + random.uniform(-0.0002, 0.0002),
+                                  lon + random.uniform(-0.0002, 0.0002))
+
+print(f"Lookups: {reverse_cache.stats['lookups']}, "
+      f"upstream calls: {reverse_cache.stats['upstream_calls']}")
+print("\nPrecision   Cell size   Hit rate")
+for precision, report in reverse_cache.hit_rate_by_precision().items():
+    marker = "  ← in use" if precision == reverse_cache.precision else ""
+    print(f"    {precision}      {report['cell_size_m']:>8.0f} m   {report['hit_rate']:6.1%}{marker}")
+
+gps_transport.close()
+gps_stand_in.stop()
@@ -0,0 +1,141 @@
+## Instant Autocomplete from a Local Prefix Index:
+
+class PrefixTrieNode:
+    """One character step in the prefix trie"""
+    __slots__ = ('children', 'top')
+
+    def __init__(self):
+        self.children = {}
+        self.top = []  # Best suggestions below this node, highest importance first
+
+class PrefixIndex:
+    """Trie over place names where every node stores its precomputed top-k suggestions"""
+
+    def __init__(self, top_k=10):
+        """
+        Args:
+            top_k: Suggestions kept per node (the most any search can return)
+        """
+        self.top_k = top_k
+        self.root = PrefixTrieNode()
+        self.names = set()
+        self.node_count = 1
+
+    @staticmethod
+    def _normalize(text):
+        return ' '.join(text.lower().split())
+
+    def add(self, suggestion):
+        """
+        Index a suggestion dict (needs 'short_name' and 'importance')
+
+        The full short name and every word inside it are indexed, so "york"
+        finds "New York City, NY, US" as well as "new y" does.
+        """
+        name = self._normalize(suggestion['short_name'])
+        self.names.add(name)
+
+        starts = [0] + [i + 1 for i, char in enumerate(name) if char == ' ']
+        for start in starts:
+            self._insert(name[start:], suggestion)
+
+    def _insert(self, key, suggestion):
+        """Walk/create the path for key, offering the suggestion to every node on it"""
+        node = self.root
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                child = PrefixTrieNode()
+                node.children[char] = child
+                self.node_count += 1
+            node = child
+            self._offer(node, suggestion)
+
+    def _offer(self, node, suggestion):
+        """Keep the suggestion in node.top if it ranks in the top k"""
+        top = node.top
+        importance = suggestion.get('importance', 0)
+
+        for i, existing in enumerate(top):
+            if existing['short_name'] == suggestion['short_name']:
+                if existing.get('importance', 0) >= importance:
+                    return
+                del top[i]
+                break
+
+        if len(top) >= self.top_k and importance <= top[-1].get('importance', 0):
+            return
+
+        position = len(top)
+        while position > 0 and top[position - 1].get('importance', 0) < importance:
+            position -= 1
+        top.insert(position, suggestion)
+        del top[self.top_k:]
+
+    def search(self, prefix, limit=5):
+        """Return up to limit suggestions whose name (or a word in it) starts with prefix"""
+        node = self.root
+        for char in self._normalize(prefix):
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return node.top[:limit]
+
+    def learn(self, suggestions):
+        """Add places learned from API results (entries without coordinates are skipped)"""
+        for suggestion in suggestions:
+            if 'latitude' in suggestion:
+                self.add(suggestion)
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def from_gazetteer(cls, gazetteer, top_k=10):
+        """Build an index over every place in a LocalGazetteerGeocoder"""
+        index = cls(top_k=top_k)
+        for record in gazetteer.iter_places():
+            location_data = gazetteer._to_location_data(record)
+            index.add({
+                'display_name': location_data['display_name'],
+                'short_name': location_data['display_name'],
+                'latitude': location_data['latitude'],
+                'longitude': location_data['longitude'],
+                'type': location_data['type'],
+                'importance': location_data['importance'],
+                'country': record['country_code'],
+                'state': record['admin1_code']
+            })
+        return index
+
+# Demonstrate local autocomplete with remote backfill
+print("\nPrefix Index Autocomplete Demonstration:")
+print("=" * 45)
+
+trie_gazetteer = LocalGazetteerGeocoder(sample_gazetteer_path, index_path=gazetteer_index_path)
+prefix_index = PrefixIndex.from_gazetteer(trie_gazetteer)
+trie_gazetteer.close()
+print(f"Indexed {len(prefix_index)} places in {prefix_index.node_count} trie nodes")
+
+trie_stand_in = LocalNominatimStandIn().start()
+trie_transport = NominatimTransport(base_url=trie_stand_in.base_url)
+local_autocomplete = LocationAutocomplete(transport=trie_transport, prefix_index=prefix_index)
+
+for typed in ["San", "Lon", "york", "Springf", "Smallv"]:
+    suggestions = local_autocomplete.get_location_suggestions(typed, max_suggestions=3)
+    names = ', '.join(suggestion['short_name'] for suggestion in suggestions)
+    print(f"'{typed}' → {names}")
+
+# "Smallv" was backfilled from the API, so it is now answered locally
+print(f"'Smallv' again → {local_autocomplete.prefix_index.search('smallv', 3)[0]['short_name']}")
+
+searches = 10000
+start = time.perf_counter()
+for _ in range(searches):
+    prefix_index.search("san", 5)
+elapsed = time.perf_counter() - start
+print(f"\nPrefix search time: {elapsed / searches * 1_000_000:.1f} µs per search")
+print(f"Autocomplete stats: {local_autocomplete.stats}")
+
+trie_transport.close()
+trie_stand_in.stop()
@@ -0,0 +1,44 @@
+## Reusing Shorter Prefixes While the User Types:
+
+def gazetteer_to_search_results(gazetteer):
+    """Turn gazetteer records into Nominatim-style search results, most important first"""
+    results = []
+    for record in gazetteer.iter_places():
+        location_data = gazetteer._to_location_data(record)
+        results.append({
+            'lat': str(location_data['latitude']),
+            'lon': str(location_data['longitude']),
+            'display_name': location_data['display_name'],
+            'type': 'city',
+            'class': 'place',
+            'importance': location_data['importance'],
+            'address': {'city': record['name'], 'state': record['admin1_code'], 'country': record['country_code']}
+        })
+    results.sort(key=lambda result: result['importance'], reverse=True)
+    return results
+
+print("\nPrefix Refinement Demonstration:")
+print("=" * 45)
+
+refinement_gazetteer = LocalGazetteerGeocoder(sample_gazetteer_path, index_path=gazetteer_index_path)
+refinement_stand_in = LocalNominatimStandIn(places=gazetteer_to_search_results(refinement_gazetteer)).start()
+refinement_gazetteer.close()
+refinement_transport = NominatimTransport(base_url=refinement_stand_in.base_url)
+
+typing_autocomplete = LocationAutocomplete(transport=refinement_transport)
+
+# Two users typing one keystroke at a time
+keystrokes = ["Sa", "San", "San ", "San D", "San Di", "Sp", "Spr", "Spri", "Sprin", "Spring"]
+for typed in keystrokes:
+    calls_before = typing_autocomplete.stats['upstream_calls']
+    suggestions = typing_autocomplete.get_location_suggestions(typed, max_suggestions=2)
+    source = "API" if typing_autocomplete.stats['upstream_calls'] > calls_before else "cache"
+    names = ', '.join(suggestion['short_name'] for suggestion in suggestions)
+    print(f"{typed!r:>10} ({source:>5}) → {names}")
+
+stats = typing_autocomplete.stats
+print(f"\nKeystrokes: {len(keystrokes)}, upstream calls: {stats['upstream_calls']}, "
+      f"upstream calls saved by refinement: {stats['upstream_calls_saved']}")
+
+refinement_transport.close()
+refinement_stand_in.stop()
@@ -0,0 +1,56 @@
+## Debouncing a Fast Typist:
+
+def simulate_typing(session, text, seconds_per_keystroke):
+    """Submit every prefix of text as if typed one key at a time"""
+    for length in range(1, len(text) + 1):
+        session.submit(text[:length])
+        time.sleep(seconds_per_keystroke)
+
+print("\nDebounced Autocomplete Demonstration:")
+print("=" * 45)
+
+debounce_gazetteer = LocalGazetteerGeocoder(sample_gazetteer_path, index_path=gazetteer_index_path)
+debounce_stand_in = LocalNominatimStandIn(
+    latency=0.1,
+    places=gazetteer_to_search_results(debounce_gazetteer)
+).start()
+debounce_gazetteer.close()
+
+# A tight rate limit so older prefixes queue up behind each other
+debounce_transport = NominatimTransport(
+    base_url=debounce_stand_in.base_url,
+    scheduler=RequestScheduler(requests_per_second=2.0)
+)
+
+delivered = []
+typing_session = AutocompleteSession(
+    LocationAutocomplete(transport=debounce_transport),
+    debounce_seconds=0.2,
+    max_suggestions=3,
+    on_result=lambda query, suggestions: delivered.append((query, suggestions))
+)
+
+# Fast typing: keystrokes arrive faster than the debounce window
+simulate_typing(typing_session, "Springfield", seconds_per_keystroke=0.05)
+typing_session.wait(timeout=5)
+
+# Changing their mind: older lookups are discarded in flight or cancelled in the rate-limit queue
+requests_before = debounce_transport.request_count
+for query in ["Paris", "Berlin", "Madrid"]:
+    typing_session.submit(query)
+    time.sleep(0.25)
+typing_session.wait(timeout=5)
+print(f"Requests sent for Paris → Berlin → Madrid: {debounce_transport.request_count - requests_before}")
+
+for query, suggestions in delivered:
+    names = ', '.join(suggestion['short_name'] for suggestion in suggestions)
+    print(f"Delivered '{query}' → {names}")
+
+stats = typing_session.stats
+print(f"\nKeystrokes: {stats['submitted']}")
+print(f"Dropped during debounce: {stats['debounced']}")
+print(f"Lookups started: {stats['lookups']} (results discarded: {stats['cancelled']})")
+print(f"Upstream requests actually sent: {debounce_transport.request_count}")
+
+debounce_transport.close()
+debounce_stand_in.stop()
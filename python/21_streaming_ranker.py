@@ -0,0 +1,53 @@
+## Streaming Top-k Ranking of Suggestions:
+
+def rank_by_full_sort(autocomplete, api_results, max_suggestions):
+    """The previous approach: build every suggestion, sort them all, then dedupe and truncate"""
+    suggestions = [autocomplete._build_suggestion(autocomplete._create_short_name(result), result)
+                   for result in api_results]
+    suggestions.sort(key=lambda x: x['importance'], reverse=True)
+
+    unique_suggestions = []
+    seen_names = set()
+    for suggestion in suggestions:
+        if suggestion['short_name'] not in seen_names:
+            unique_suggestions.append(suggestion)
+            seen_names.add(suggestion['short_name'])
+            if len(unique_suggestions) >= max_suggestions:
+                break
+    return unique_suggestions
+
+print("\nStreaming Ranker Demonstration:")
+print("=" * 45)
+
+# A large API answer full of duplicates (the same town reported as city, boundary, ...)
+random.seed(21)
+ranking_results = []
+for i in range(2000):
+    town = f"Town {random.randint(1, 400)}"
+    ranking_results.append({
+        'lat': str(random.uniform(-60, 60)),
+        'lon': str(random.uniform(-180, 180)),
+        'display_name': f"{town}, Some County, Some Country",
+        'type': random.choice(['city', 'town', 'village']),
+        'class': 'place',
+        'importance': round(random.random(), 3),
+        'address': {'city': town, 'country': 'Some Country'}
+    })
+
+ranking_autocomplete = LocationAutocomplete(transport=NominatimTransport())
+
+streamed = ranking_autocomplete._process_autocomplete_results(ranking_results, 10)
+sorted_all = rank_by_full_sort(ranking_autocomplete, ranking_results, 10)
+print(f"Same top 10 as the full sort: {streamed == sorted_all}")
+
+for label, rank in [("Full sort", lambda: rank_by_full_sort(ranking_autocomplete, ranking_results, 10)),
+                    ("Streaming top-k", lambda: ranking_autocomplete._process_autocomplete_results(ranking_results, 10))]:
+    start = time.perf_counter()
+    for _ in range(50):
+        rank()
+    print(f"{label:>16}: {(time.perf_counter() - start) / 50 * 1000:.2f} ms per keystroke")
+
+# The ranker works on any suggestion source, e.g. merging the prefix index with API results
+local_results = [{'short_name': 'Town 7', 'display_name': 'Town 7', 'importance': 2.0}]
+merged = SuggestionRanker.top(local_results + streamed, 3)
+print(f"\nMerged top 3: {', '.join(suggestion['short_name'] for suggestion in merged)}")
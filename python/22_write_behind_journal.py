@@ -0,0 +1,76 @@
+## Persisting User Data with a Write-Behind Journal:
+
+def rewrite_whole_file(manager, path):
+    """The previous approach: dump all user data, indented, after every change"""
+    saved_data = dict(manager.user_data, location_cache=manager.user_data['location_cache'].to_dict())
+    with open(path, 'w') as f:
+        json.dump(saved_data, f, indent=2)
+
+def sample_location(i):
+    return {
+        'original_input': f"Town {i}",
+        'cleaned_input': f"Town {i}",
+        'display_name': f"Town {i}, Some County, Some Country",
+        'short_name': f"Town {i}, Some Country",
+        'latitude': random.uniform(-60, 60),
+        'longitude': random.uniform(-180, 180),
+        'type': 'town'
+    }
+
+print("\nWrite-Behind Journal Demonstration:")
+print("=" * 45)
+
+journal_dir = tempfile.mkdtemp()
+journal_data_file = os.path.join(journal_dir, "user_locations.json")
+journal_stand_in = LocalNominatimStandIn().start()
+journal_transport = NominatimTransport(base_url=journal_stand_in.base_url)
+
+journal_manager = WeatherLocationManager(
+    data_file=journal_data_file,
+    geocoder=SimpleGeocoder(transport=journal_transport),
+    cache_size=10000,
+    cache_max_bytes=None,
+    compact_after=1000
+)
+
+# A user with a large cache already on disk
+random.seed(22)
+journal_manager.user_data['location_cache'].update({f"town {i}": sample_location(i) for i in range(5000)})
+journal_manager.save_user_data()
+
+changes = 200
+start = time.perf_counter()
+for i in range(changes):
+    rewrite_whole_file(journal_manager, os.path.join(journal_dir, "rewritten.json"))
+rewrite_time = time.perf_counter() - start
+
+start = time.perf_counter()
+for i in range(5000, 5000 + changes):
+    location_data = sample_location(i)
+    journal_manager.user_data['location_cache'].put(f"town {i}", location_data)
+    journal_manager._record_change('cache_put', f"town {i}", location_data)
+journal_manager.journal.flush()
+journal_time = time.perf_counter() - start
+
+print(f"Full rewrite per change: {rewrite_time / changes * 1000:.2f} ms")
+print(f"Journaled change:        {journal_time / changes * 1000:.3f} ms "
+      f"({journal_manager.journal.stats['flushes']} batched appends)")
+
+# Simulate a crash: the process dies without close(), after the last batch was flushed
+journal_manager.add_favorite_location("Springfield")
+journal_manager.journal.flush()
+
+recovered_manager = WeatherLocationManager(
+    data_file=journal_data_file,
+    geocoder=SimpleGeocoder(transport=journal_transport),
+    cache_size=10000,
+    cache_max_bytes=None
+)
+summary = recovered_manager.get_user_summary()
+print(f"After restart: {summary['cache_count']} cached locations, {summary['favorite_count']} favorite(s)")
+
+recovered_manager.close()
+print(f"Journal size after compaction: {os.path.getsize(recovered_manager.journal.journal_path)} bytes")
+
+journal_transport.close()
+journal_stand_in.stop()
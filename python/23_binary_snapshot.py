@@ -0,0 +1,53 @@
+## Fast Cold Starts with a Binary Snapshot:
+
+def timed_manager(data_file, snapshot_format, geocoder):
+    """Construct a manager and report how long loading its data took"""
+    start = time.perf_counter()
+    manager = WeatherLocationManager(
+        data_file=data_file,
+        geocoder=geocoder,
+        cache_size=50000,
+        cache_max_bytes=None,
+        snapshot_format=snapshot_format
+    )
+    return manager, time.perf_counter() - start
+
+print("\nBinary Snapshot Demonstration:")
+print("=" * 45)
+
+snapshot_dir = tempfile.mkdtemp()
+snapshot_data_file = os.path.join(snapshot_dir, "user_locations.dat")
+snapshot_stand_in = LocalNominatimStandIn().start()
+snapshot_geocoder = SimpleGeocoder(transport=NominatimTransport(base_url=snapshot_stand_in.base_url))
+
+# An existing JSON file with a big cache and a few favorites
+json_manager, _ = timed_manager(snapshot_data_file, 'json', snapshot_geocoder)
+random.seed(23)
+json_manager.user_data['location_cache'].update({f"town {i}": sample_location(i) for i in range(20000)})
+json_manager.add_favorite_location("Springfield")
+json_manager.close()
+
+_, json_load_time = timed_manager(snapshot_data_file, 'json', snapshot_geocoder)
+json_size = os.path.getsize(snapshot_data_file)
+
+# Opening it in binary mode migrates the file once
+migrated_manager, _ = timed_manager(snapshot_data_file, 'binary', snapshot_geocoder)
+migrated_manager.close()
+
+binary_manager, binary_load_time = timed_manager(snapshot_data_file, 'binary', snapshot_geocoder)
+binary_size = os.path.getsize(snapshot_data_file)
+
+print(f"\nJSON snapshot:   {json_size / 1024:8.0f} KB, cold start {json_load_time * 1000:6.1f} ms")
+print(f"Binary snapshot: {binary_size / 1024:8.0f} KB, cold start {binary_load_time * 1000:6.1f} ms")
+
+# Favorites are ready at once; cache entries are decoded only when used
+favorites = ', '.join(favorite['short_name'] for favorite in binary_manager.user_data['favorite_locations'])
+print(f"Favorites: {favorites}")
+result = binary_manager.process_location_input("Springfield")
+print(f"Springfield served from: {result['source']}")
+cache_stats = binary_manager.user_data['location_cache'].get_stats()
+print(f"Cached entries: {cache_stats['entries']}, decoded so far: {cache_stats['lazy_decodes']}")
+
+binary_manager.close()
+snapshot_geocoder.transport.close()
+snapshot_stand_in.stop()
@@ -0,0 +1,239 @@
+## Serving Many Users from One Process:
+import contextlib
+import hashlib
+import tracemalloc
+
+class MultiTenantLocationManager:
+    """Per-user location data in sharded files, served from one shared geocode cache"""
+
+    def __init__(self, data_dir="user_data", geocoder=None, max_active_users=1000,
+                 cache_size=10000, cache_max_bytes=None, cache_ttl=7 * 24 * 60 * 60,
+                 cache_backend=None, snapshot_format='json', place_store=None, instrumentation=None,
+                 negative_cache_size=10000, negative_cache_ttl=10 * 60):
+        """
+        Args:
+            data_dir: Root directory; each user's file lives in one of 256 shard subdirectories
+            geocoder: Shared geocoder (defaults to SimpleGeocoder())
+            max_active_users: Users kept in memory; the least recently active are saved and unloaded
+            cache_size, cache_max_bytes, cache_ttl, cache_backend: Settings of the shared geocode cache
+            snapshot_format: 'json' or 'binary' for the per-user files
+            place_store: Optional PlaceStore; its cache is then the shared geocode cache
+            instrumentation: Optional Instrumentation shared by every user's pipeline
+            negative_cache_size, negative_cache_ttl: Settings of the shared cache of names
+                                                     Nominatim found nothing for
+        """
+        self.data_dir = data_dir
+        self.snapshot_format = snapshot_format
+
+        # Shared by every user's WeatherLocationManager (see its tenant_of argument)
+        self.validator = LocationValidator()
+        self.geocoder = geocoder or SimpleGeocoder()
+        self.place_store = place_store
+        self.instrumentation = instrumentation
+        self.autocomplete = LocationAutocomplete(transport=self.geocoder.transport, place_store=place_store)
+        self.in_flight = SingleFlight()
+        self.negative_cache = BoundedCache(max_entries=negative_cache_size, ttl=negative_cache_ttl)
+        if place_store is not None:
+            self.location_cache = place_store.cache
+        else:
+            self.location_cache = BoundedCache(max_entries=cache_size, max_bytes=cache_max_bytes, ttl=cache_ttl,
+                                               backend=cache_backend)
+            self.location_cache.warm()
+
+        # Loaded users, least recently active first; evicted users are saved before they go
+        self.active_users = BoundedCache(max_entries=max_active_users, on_evict=self._retire_user)
+        self.users_lock = threading.Lock()
+        self.pins = {}      # user_id -> callers inside for_user(); pinned managers are never closed
+        self.retiring = {}  # user_id -> evicted manager still pinned by a caller
+        self.busy = {}      # user_id -> Event set once that user's file is loaded or saved
+        self.to_close = []  # Evicted, unpinned managers, closed after users_lock is released
+        self.stats = {'user_loads': 0, 'user_unloads': 0}
+
+    def user_file(self, user_id):
+        """Path of a user's data file, spread over shard directories so none grows huge"""
+        digest = hashlib.sha1(user_id.encode('utf-8')).hexdigest()
+        extension = '.json' if self.snapshot_format == 'json' else '.dat'
+        return os.path.join(self.data_dir, digest[:2], digest + extension)
+
+    @contextlib.contextmanager
+    def for_user(self, user_id):
+        """
+        Use the WeatherLocationManager holding this user's data, loading it if needed
+
+            with tenants.for_user("user-1") as manager:
+                manager.add_favorite_location("Paris")
+
+        The manager stays open for the whole with block, even if other users'
+        requests evict it meanwhile; it is saved and closed once the last caller leaves.
+        """
+        manager = self._acquire(user_id)
+        try:
+            yield manager
+        finally:
+            self._release(user_id)
+
+    def _acquire(self, user_id):
+        """Pin and return the user's manager; file I/O happens outside users_lock"""
+        while True:
+            with self.users_lock:
+                busy = self.busy.get(user_id)
+                if busy is None:
+                    manager = self.active_users.get(user_id)
+                    if manager is None and user_id in self.retiring:
+                        # Evicted while still in use: take it back rather than open the file twice
+                        manager = self.retiring.pop(user_id)
+                        self.active_users.put(user_id, manager)
+                    if manager is not None:
+                        self.pins[user_id] = self.pins.get(user_id, 0) + 1
+                        break
+                    busy = self.busy[user_id] = threading.Event()
+                    loading = True
+                else:
+                    loading = False
+
+            if not loading:
+                busy.wait()  # Another thread is loading this user, or saving their previous manager
+                continue
+
+            try:
+                data_file = self.user_file(user_id)
+                os.makedirs(os.path.dirname(data_file), exist_ok=True)
+                manager = WeatherLocationManager(data_file=data_file, snapshot_format=self.snapshot_format,
+                                                 tenant_of=self)
+            finally:
+                with self.users_lock:
+                    del self.busy[user_id]
+                    if manager is not None:
+                        self.active_users.put(user_id, manager)  # May evict other users
+                        self.pins[user_id] = self.pins.get(user_id, 0) + 1
+                        self.stats['user_loads'] += 1
+                busy.set()
+            break
+
+        self._close_retired()
+        return manager
+
+    def _release(self, user_id):
+        with self.users_lock:
+            self.pins[user_id] -= 1
+            if not self.pins[user_id]:
+                del self.pins[user_id]
+                if user_id in self.retiring:
+                    self._schedule_close(user_id)
+        self._close_retired()
+
+    def _retire_user(self, user_id, manager, reason):
+        """Eviction callback (users_lock is held): close the manager once nobody is using it"""
+        self.retiring[user_id] = manager
+        if not self.pins.get(user_id):
+            self._schedule_close(user_id)
+
+    def _schedule_close(self, user_id):
+        # Until the close finishes, a new request for this user waits instead of reading a half-saved file
+        self.busy[user_id] = threading.Event()
+        self.to_close.append((user_id, self.retiring.pop(user_id)))
+
+    def _close_retired(self):
+        """Fold evicted users' journals into their files without holding up other users"""
+        while True:
+            with self.users_lock:
+                if not self.to_close:
+                    return
+                user_id, manager = self.to_close.pop()
+
+            try:
+                manager.close()
+            finally:
+                with self.users_lock:
+                    busy = self.busy.pop(user_id)
+                    self.stats['user_unloads'] += 1
+                busy.set()
+
+    def get_location_for_weather(self, user_id, location_input=None):
+        with self.for_user(user_id) as manager:
+            return manager.get_location_for_weather(location_input)
+
+    def set_default_location(self, user_id, location_input):
+        with self.for_user(user_id) as manager:
+            return manager.set_default_location(location_input)
+
+    def add_favorite_location(self, user_id, location_input):
+        with self.for_user(user_id) as manager:
+            return manager.add_favorite_location(location_input)
+
+    def close(self):
+        """
+        Save and unload every user, the way eviction does
+
+        A manager still used inside for_user() is closed when its last caller
+        leaves, and loads or saves other threads have in progress are waited for.
+        """
+        while True:
+            with self.users_lock:
+                for user_id, manager in self.active_users.to_dict().items():
+                    self._retire_user(user_id, manager, 'closed')
+                self.active_users.clear()
+                busy = list(self.busy.values())
+
+            self._close_retired()
+            if not busy:
+                return
+            for event in busy:
+                event.wait()  # A user loaded meanwhile is retired on the next pass
+
+# Demonstrate many users sharing one cache
+print("\nMulti-Tenant Location Manager Demonstration:")
+print("=" * 45)
+
+tenant_stand_in = LocalNominatimStandIn().start()
+tenant_transport = NominatimTransport(base_url=tenant_stand_in.base_url)
+tenants = MultiTenantLocationManager(
+    data_dir=tempfile.mkdtemp(),
+    geocoder=SimpleGeocoder(transport=tenant_transport),
+    max_active_users=200
+)
+
+cities = ["Springfield", "Riverside", "Franklin", "Greenville", "Bristol", "Clinton", "Fairview", "Salem"]
+random.seed(24)
+tracemalloc.start()
+
+# Per-user status messages are silenced so the memory figures stay readable
+with silenced_logs():
+    memory_by_users = {}
+    for user_number in range(1, 2001):
+        user_id = f"user-{user_number}"
+        tenants.set_default_location(user_id, random.choice(cities))
+        tenants.add_favorite_location(user_id, random.choice(cities))
+        if user_number in (200, 1000, 2000):
+            memory_by_users[user_number] = tracemalloc.get_traced_memory()[0]
+
+    # A user unloaded long ago is read back from their shard file
+    first_user = tenants.get_location_for_weather("user-1")
+
+tracemalloc.stop()
+
+for user_count, memory in memory_by_users.items():
+    print(f"{user_count:>5} users served: {memory / 1024 / 1024:6.2f} MB in use")
+print(f"Users loaded: {tenants.stats['user_loads']}, unloaded: {tenants.stats['user_unloads']}, "
+      f"in memory: {len(tenants.active_users)}")
+print(f"Shared cache entries: {len(tenants.location_cache)}, upstream requests: {tenant_transport.request_count}")
+print(f"user-1's default location after reload: {first_user['location_data']['name']}")
+
+# A caller holding a user keeps that manager open even when other users' requests evict it
+pinned_tenants = MultiTenantLocationManager(data_dir=tempfile.mkdtemp(),
+                                            geocoder=SimpleGeocoder(transport=tenant_transport), max_active_users=2)
+with silenced_logs():
+    with pinned_tenants.for_user("alice") as alice:
+        for other_user in ("bob", "carol", "dave"):
+            pinned_tenants.set_default_location(other_user, "Salem")
+        evicted_while_in_use = "alice" not in pinned_tenants.active_users
+        alice.add_favorite_location("Bristol")  # Still journaled: the manager is only closed after the block
+    with pinned_tenants.for_user("alice") as alice:
+        alice_favorites = [favorite['name'] for favorite in alice.user_data['favorite_locations']]
+    pinned_tenants.close()
+print(f"alice evicted while in use: {evicted_while_in_use}; favorites after reload: {alice_favorites}")
+
+with silenced_logs():
+    tenants.close()
+tenant_transport.close()
+tenant_stand_in.stop()
@@ -0,0 +1,92 @@
+## Stress-Testing the Manager and Service from Many Threads:
+
+def run_stress(manager, service, thread_count, duration=1.0):
+    """
+    Hammer one manager and one service with a read-heavy mix of operations
+
+    Returns:
+        dict with operations per second, read latency percentiles and error count
+    """
+    cities = ["Springfield", "Riverside", "Franklin", "Greenville", "Bristol"]
+    operation_counts = []
+    read_latencies = []
+    errors = []
+    results_lock = threading.Lock()
+    start_line = threading.Barrier(thread_count)
+
+    def worker(seed):
+        chooser = random.Random(seed)
+        local_latencies = []
+        operations = 0
+        start_line.wait()
+        deadline = time.perf_counter() + duration
+
+        while time.perf_counter() < deadline:
+            roll = chooser.random()
+            try:
+                if roll < 0.85:
+                    # Most requests just want the weather for the user's default location
+                    started = time.perf_counter()
+                    manager.get_location_for_weather()
+                    local_latencies.append(time.perf_counter() - started)
+                elif roll < 0.95:
+                    manager.get_location_for_weather(chooser.choice(cities))  # Writes search history
+                elif roll < 0.99:
+                    service.process_location_request(chooser.choice(cities))
+                else:
+                    manager.add_favorite_location(chooser.choice(cities))
+            except Exception as e:
+                errors.append(e)
+            operations += 1
+
+        with results_lock:
+            operation_counts.append(operations)
+            read_latencies.extend(local_latencies)
+
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    read_latencies.sort()
+    return {
+        'ops_per_second': sum(operation_counts) / duration,
+        'read_p50_us': read_latencies[len(read_latencies) // 2] * 1_000_000,
+        'read_p99_us': read_latencies[int(len(read_latencies) * 0.99)] * 1_000_000,
+        'errors': len(errors)
+    }
+
+print("\nConcurrency Stress Demonstration:")
+print("=" * 45)
+
+stress_stand_in = LocalNominatimStandIn().start()
+stress_geocoder = SimpleGeocoder(transport=NominatimTransport(base_url=stress_stand_in.base_url))
+stress_data_file = os.path.join(tempfile.mkdtemp(), "user_locations.json")
+
+with silenced_logs():
+    stress_manager = WeatherLocationManager(data_file=stress_data_file, geocoder=stress_geocoder,
+                                            compact_after=200)
+    stress_service = WeatherLocationService(geocoder=stress_geocoder)
+    stress_manager.set_default_location("Chicago")
+
+    stress_results = {thread_count: run_stress(stress_manager, stress_service, thread_count)
+                      for thread_count in (1, 2, 4, 8, 16)}
+
+print("Threads   Ops/sec   Default read p50   p99      Errors")
+for thread_count, report in stress_results.items():
+    print(f"{thread_count:>7} {report['ops_per_second']:>9,.0f} {report['read_p50_us']:>12.1f} µs "
+          f"{report['read_p99_us']:>8.1f} µs {report['errors']:>6}")
+
+# Everything journaled under load must come back exactly after a restart
+with silenced_logs():
+    stress_manager.close()
+    reloaded_manager = WeatherLocationManager(data_file=stress_data_file, geocoder=stress_geocoder)
+
+same_favorites = reloaded_manager.user_data['favorite_locations'] == stress_manager.user_data['favorite_locations']
+same_history = reloaded_manager.user_data['search_history'] == stress_manager.user_data['search_history']
+print(f"\nState after restart matches memory: favorites {same_favorites}, history {same_history}")
+print(f"Journal compactions under load: {stress_manager.journal.stats['compactions']}")
+
+stress_geocoder.transport.close()
+stress_stand_in.stop()
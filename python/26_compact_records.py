@@ -0,0 +1,75 @@
+## Shrinking Cached Locations with Slots, Interning and Columns:
+
+def measure_memory(build):
+    """Bytes still allocated by whatever build() returns"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return kept, used
+
+def sample_place(i):
+    """Raw fields for one of a few thousand distinct places"""
+    town = f"Town {i % 5000}"
+    return (f"{town}, Some County, Some Country", f"{town}, Some Country",
+            random.uniform(-60, 60), random.uniform(-180, 180), 'town')
+
+print("\nCompact Location Records Demonstration:")
+print("=" * 45)
+
+entry_count = 200_000
+random.seed(26)
+places = [sample_place(i) for i in range(entry_count)]
+
+def build_dicts():
+    return {f"query {i}": {
+        'original_input': f"query {i}",
+        'cleaned_input': f"Query {i}",
+        'display_name': display_name,
+        'short_name': short_name,
+        'latitude': latitude,
+        'longitude': longitude,
+        'type': place_type
+    } for i, (display_name, short_name, latitude, longitude, place_type) in enumerate(places)}
+
+def build_records():
+    return {f"query {i}": Location(display_name, latitude, longitude, place_type, short_name)
+            for i, (display_name, short_name, latitude, longitude, place_type) in enumerate(places)}
+
+def build_columns():
+    # Hot places as Location records in memory, everything in the columnar table behind them
+    cache = BoundedCache(max_entries=1000, backend=LocationTable())
+    for i, (display_name, short_name, latitude, longitude, place_type) in enumerate(places):
+        cache.put(f"query {i}", Location(display_name, latitude, longitude, place_type, short_name))
+    return cache
+
+_, dict_bytes = measure_memory(build_dicts)
+_, record_bytes = measure_memory(build_records)
+column_cache, column_bytes = measure_memory(build_columns)
+
+print(f"{entry_count:,} cached locations:")
+print(f"  Nested dicts:            {dict_bytes / 1024 / 1024:7.1f} MB")
+print(f"  __slots__ records:       {record_bytes / 1024 / 1024:7.1f} MB")
+print(f"  LRU + columnar table:    {column_bytes / 1024 / 1024:7.1f} MB")
+
+# A cold place comes back from the columns as a Location, then stays hot in memory
+cold_place = column_cache.get("query 12")
+print(f"\nCold lookup: {cold_place['short_name']} at ({cold_place['latitude']:.2f}, {cold_place['longitude']:.2f})")
+print(f"Served from the columnar table: {column_cache.get_stats()['backend_hits']} lookup(s)")
+
+# Existing callers still get something that reads like the old dict
+records_stand_in = LocalNominatimStandIn().start()
+records_service = WeatherLocationService(
+    geocoder=SimpleGeocoder(transport=NominatimTransport(base_url=records_stand_in.base_url))
+)
+first = records_service.process_location_request("springfield")['location_data']
+second = records_service.process_location_request("Springfield")['location_data']
+
+print(f"\nAs a dict: {dict(second)}")
+print(f"Each response keeps its own input: {first['original_input']!r} vs {second['original_input']!r}")
+print(f"Both share one cached record: {first.location is second.location}")
+print(f"JSON: {json.dumps(second)[:70]}...")
+
+records_service.geocoder.transport.close()
+records_stand_in.stop()
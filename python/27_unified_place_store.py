@@ -0,0 +1,104 @@
+## One Place Store for Autocomplete, Geocoding and the Manager:
+
+class PlaceStore:
+    """
+    Known places shared by LocationAutocomplete, WeatherLocationService and WeatherLocationManager
+
+    Autocomplete suggestions already carry coordinates, so every suggestion
+    served (from the API, the prefix index or the fuzzy index) is stored as a
+    geocode cache entry under its normalized short name: picking it is then a
+    cache hit. Geocoded places are fed back into the prefix index so
+    autocomplete can offer them without an upstream call.
+    """
+
+    def __init__(self, cache=None, prefix_index=None, validator=None,
+                 cache_size=5000, cache_ttl=7 * 24 * 60 * 60):
+        """
+        Args:
+            cache: BoundedCache used as the geocode cache (a new one is created if None)
+            prefix_index: PrefixIndex that geocoded places are added to (a new one is created if None)
+            validator: LocationValidator used to normalize names into cache keys
+            cache_size, cache_ttl: Settings for a newly created cache
+        """
+        self.cache = cache if cache is not None else BoundedCache(max_entries=cache_size, ttl=cache_ttl)
+        self.prefix_index = prefix_index if prefix_index is not None else PrefixIndex()
+        self.validator = validator or LocationValidator()
+        self.stats = {'learned_from_autocomplete': 0, 'learned_from_geocoding': 0}
+        self.stats_lock = threading.Lock()  # Autocomplete and geocoding threads both learn
+
+    def cache_key(self, name):
+        """The key a geocode lookup for name would use, or None if name would not validate"""
+        cleaned, _ = self.validator.clean_location_input(name)
+        return cleaned.lower() if cleaned else None
+
+    def learn_suggestions(self, suggestions):
+        """Store autocomplete suggestions with coordinates as geocode cache entries"""
+        for suggestion in suggestions:
+            if 'latitude' not in suggestion:
+                continue
+
+            key = self.cache_key(suggestion['short_name'])
+            if key is None or key in self.cache:
+                continue
+
+            self.cache.put(key, Location(
+                suggestion['display_name'],
+                suggestion['latitude'],
+                suggestion['longitude'],
+                suggestion.get('type', ''),
+                short_name=suggestion['short_name']
+            ))
+            with self.stats_lock:
+                self.stats['learned_from_autocomplete'] += 1
+
+    def learn_location(self, location, importance=0.0):
+        """Offer a geocoded place to autocomplete through the prefix index"""
+        self.prefix_index.add({
+            'display_name': location['display_name'],
+            'short_name': location.get('short_name', location['display_name']),
+            'latitude': location['latitude'],
+            'longitude': location['longitude'],
+            'type': location.get('type', ''),
+            'importance': importance
+        })
+        with self.stats_lock:
+            self.stats['learned_from_geocoding'] += 1
+
+# Demonstrate picking a suggestion without a second lookup
+print("\nUnified Place Store Demonstration:")
+print("=" * 45)
+
+store_gazetteer = LocalGazetteerGeocoder(sample_gazetteer_path, index_path=gazetteer_index_path)
+store_stand_in = LocalNominatimStandIn(places=gazetteer_to_search_results(store_gazetteer)).start()
+store_gazetteer.close()
+store_transport = NominatimTransport(base_url=store_stand_in.base_url)
+
+place_store = PlaceStore()
+unified_manager = WeatherLocationManager(
+    data_file=os.path.join(tempfile.mkdtemp(), "user_locations.json"),
+    geocoder=SimpleGeocoder(transport=store_transport),
+    place_store=place_store
+)
+
+# 1. The user types, then picks the first suggestion
+suggestions = unified_manager.autocomplete.get_location_suggestions("Spring", max_suggestions=3)
+picked = suggestions[0]
+print(f"Picked suggestion: {picked['short_name']}")
+
+requests_before = store_transport.request_count
+result = unified_manager.process_location_input(picked['short_name'])
+print(f"Resolved from: {result['source']} "
+      f"(upstream requests for the pick: {store_transport.request_count - requests_before})")
+
+# 2. A place geocoded directly becomes an instant autocomplete answer
+unified_manager.process_location_input("Madrid")
+requests_before = store_transport.request_count
+madrid_suggestions = unified_manager.autocomplete.get_location_suggestions("Madr", max_suggestions=1)
+print(f"'Madr' → {madrid_suggestions[0]['short_name']} "
+      f"(upstream requests: {store_transport.request_count - requests_before})")
+
+print(f"\nPlace store stats: {place_store.stats}")
+
+unified_manager.close()
+store_transport.close()
+store_stand_in.stop()
@@ -0,0 +1,186 @@
+## A Repeatable Offline Benchmark Suite:
+
+def synthetic_city_names(count, seed=0):
+    """Distinct pronounceable city names that pass LocationValidator"""
+    chooser = random.Random(seed)
+    consonants, vowels = 'bcdfghklmnprstvz', 'aeiou'
+    names = set()
+    while len(names) < count:
+        syllables = chooser.randint(2, 4)
+        names.add(''.join(chooser.choice(consonants) + chooser.choice(vowels)
+                          for _ in range(syllables)).title())
+    return sorted(names)
+
+def synthetic_places(names, seed=0):
+    """Nominatim-style search results for the synthetic names, most important first"""
+    chooser = random.Random(seed)
+    places = []
+    for rank, name in enumerate(names):
+        places.append({
+            'lat': f"{chooser.uniform(-60, 60):.4f}",
+            'lon': f"{chooser.uniform(-180, 180):.4f}",
+            'display_name': f"{name}, ZZ",  # No region words that would match typed prefixes
+            'type': 'city',
+            'class': 'place',
+            'importance': 1 / (rank + 1),
+            'address': {'city': name, 'state': '', 'country': 'ZZ'}
+        })
+    return places
+
+def zipf_workload(names, count, exponent=1.1, seed=0):
+    """Draw count names where the k-th most popular is requested in proportion to 1/k^exponent"""
+    weights = [1 / rank ** exponent for rank in range(1, len(names) + 1)]
+    return random.Random(seed).choices(names, weights=weights, k=count)
+
+def keystroke_stream(names, count, seed=0):
+    """Prefixes a user types on the way to each name: 'Ka', 'Kar', 'Karo', ..."""
+    chooser = random.Random(seed)
+    stream = []
+    while len(stream) < count:
+        name = chooser.choice(names)
+        stream.extend(name[:length] for length in range(2, len(name) + 1))
+    return stream[:count]
+
+def measure_scenario(name, operation, inputs, stand_in):
+    """
+    Run operation once per input and time each call
+
+    Returns:
+        dict with ops/sec, p50/p95/p99 latency in milliseconds, upstream calls and failures
+    """
+    upstream_before = stand_in.stats['search'] + stand_in.stats['reverse']
+    latencies = []
+    failures = 0
+
+    # Status lines from the geocoders would swamp the report
+    with silenced_logs():
+        start = time.perf_counter()
+        for item in inputs:
+            started = time.perf_counter()
+            if not operation(item):
+                failures += 1
+            latencies.append(time.perf_counter() - started)
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'scenario': name,
+        'operations': len(inputs),
+        'ops_per_second': len(inputs) / elapsed,
+        'p50_ms': latencies[len(latencies) // 2] * 1000,
+        'p95_ms': latencies[int(len(latencies) * 0.95)] * 1000,
+        'p99_ms': latencies[int(len(latencies) * 0.99)] * 1000,
+        'upstream_calls': stand_in.stats['search'] + stand_in.stats['reverse'] - upstream_before,
+        'failures': failures
+    }
+
+def run_benchmark_suite(operations=500, latency=0.0, error_rate=0.0, result_count=1, seed=28):
+    """
+    Benchmark the geocoder, autocomplete, service and manager against a local stand-in
+
+    Args:
+        operations: Calls per scenario
+        latency: Simulated upstream round-trip time in seconds
+        error_rate: Fraction of upstream requests answered with HTTP 503
+        result_count: Results per geocoding /search response
+        seed: Seed for the workloads and the stand-in's error draws
+
+    Returns:
+        List of scenario results (see measure_scenario)
+    """
+    stand_in = LocalNominatimStandIn(latency=latency, error_rate=error_rate,
+                                     result_count=result_count, seed=seed).start()
+    # No retries, so every upstream error shows up as a failure instead of a backoff sleep
+    transport = NominatimTransport(base_url=stand_in.base_url, max_retries=0)
+    names = synthetic_city_names(2000, seed)
+
+    # Autocomplete needs real prefix matches, so it searches a gazetteer of the same names
+    places_stand_in = LocalNominatimStandIn(latency=latency, places=synthetic_places(names, seed),
+                                            error_rate=error_rate, seed=seed).start()
+    places_transport = NominatimTransport(base_url=places_stand_in.base_url, max_retries=0)
+    distinct = names[:operations]
+    popular = zipf_workload(names, operations, seed=seed)
+    chooser = random.Random(seed)
+    coordinates = [(chooser.uniform(-60, 60), chooser.uniform(-180, 180)) for _ in range(operations)]
+
+    geocoder = SimpleGeocoder(transport=transport)
+    cold_service = WeatherLocationService(geocoder=geocoder)
+    zipf_service = WeatherLocationService(geocoder=geocoder)
+    autocomplete = LocationAutocomplete(transport=places_transport)
+    with silenced_logs():
+        manager = WeatherLocationManager(data_file=os.path.join(tempfile.mkdtemp(), "bench_locations.json"),
+                                         geocoder=geocoder)
+
+    def served(response):
+        return response['success']
+
+    results = [
+        measure_scenario("geocoder search", geocoder.geocode_location, distinct, stand_in),
+        measure_scenario("geocoder reverse", lambda point: geocoder.reverse_geocode(*point), coordinates, stand_in),
+        measure_scenario("service cold cache",
+                         lambda city: served(cold_service.process_location_request(city)), distinct, stand_in),
+        measure_scenario("service warm cache",
+                         lambda city: served(cold_service.process_location_request(city)), distinct, stand_in),
+        measure_scenario("service zipf popularity",
+                         lambda city: served(zipf_service.process_location_request(city)), popular, stand_in),
+        measure_scenario("manager zipf popularity",
+                         lambda city: served(manager.get_location_for_weather(city)), popular, stand_in),
+        measure_scenario("autocomplete keystrokes",
+                         lambda typed: autocomplete.get_location_suggestions(typed),
+                         keystroke_stream(names, operations, seed), places_stand_in),
+    ]
+
+    with silenced_logs():
+        manager.close()
+    for server_transport, server in ((transport, stand_in), (places_transport, places_stand_in)):
+        server_transport.close()
+        server.stop()
+    return results
+
+def print_benchmark_report(results):
+    print(f"{'Scenario':<26} {'Ops/sec':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'Upstream':>9} {'Failed':>7}")
+    for result in results:
+        print(f"{result['scenario']:<26} {result['ops_per_second']:>9,.0f} {result['p50_ms']:>8.2f} "
+              f"{result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} {result['upstream_calls']:>9} "
+              f"{result['failures']:>7}")
+
+def compare_to_baseline(results, baseline, tolerance=0.25):
+    """
+    List scenarios that got slower or chattier than a saved baseline
+
+    Upstream call counts are deterministic for a given seed, so any increase is
+    reported; throughput and p95 latency are allowed to drift by tolerance.
+    """
+    regressions = []
+    baseline_by_name = {result['scenario']: result for result in baseline}
+    for result in results:
+        before = baseline_by_name.get(result['scenario'])
+        if before is None:
+            continue
+        if result['upstream_calls'] > before['upstream_calls']:
+            regressions.append(f"{result['scenario']}: upstream calls {before['upstream_calls']} → "
+                               f"{result['upstream_calls']}")
+        if result['ops_per_second'] < before['ops_per_second'] * (1 - tolerance):
+            regressions.append(f"{result['scenario']}: {before['ops_per_second']:,.0f} → "
+                               f"{result['ops_per_second']:,.0f} ops/sec")
+        if result['p95_ms'] > before['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{result['scenario']}: p95 {before['p95_ms']:.2f} → {result['p95_ms']:.2f} ms")
+    return regressions
+
+# Demonstrate the suite on a fast and a slow, flaky upstream
+print("\nOffline Benchmark Suite Demonstration:")
+print("=" * 45)
+
+print("Fast upstream (no latency, 5 results per search):")
+fast_results = run_benchmark_suite(operations=300, result_count=5)
+print_benchmark_report(fast_results)
+
+print("\nSlow, flaky upstream (5 ms latency, 5% errors):")
+flaky_results = run_benchmark_suite(operations=300, latency=0.005, error_rate=0.05, result_count=5)
+print_benchmark_report(flaky_results)
+
+# The same run compared against itself reports nothing; the flaky one is flagged
+print(f"\nRegressions vs. fast baseline (rerun): {compare_to_baseline(fast_results, fast_results) or 'none'}")
+print("Regressions vs. fast baseline (flaky):")
+for regression in compare_to_baseline(flaky_results, fast_results)[:4]:
+    print(f"  {regression}")
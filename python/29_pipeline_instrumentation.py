@@ -0,0 +1,162 @@
+## Seeing Where the Time Goes: Per-Stage Instrumentation:
+
+class LatencyHistogram:
+    """Latency counts in power-of-two microsecond buckets (cheap to record, easy to merge)"""
+
+    def __init__(self):
+        self.buckets = {}  # Bucket number -> count; bucket b holds durations below 2**b µs
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        bucket = int(seconds * 1_000_000).bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction):
+        """Upper bound in seconds of the bucket holding the given fraction of samples"""
+        if not self.count:
+            return 0.0
+
+        rank = fraction * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(2 ** bucket / 1_000_000, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count * 1000 if self.count else 0.0,
+            'p50_ms': self.percentile(0.50) * 1000,
+            'p95_ms': self.percentile(0.95) * 1000,
+            'p99_ms': self.percentile(0.99) * 1000,
+            'max_ms': self.max * 1000,
+            'buckets_us': {2 ** bucket: count for bucket, count in sorted(self.buckets.items())}
+        }
+
+class Instrumentation:
+    """
+    Stage timers, counters and hooks for the location pipeline
+
+    Pass one instance to NominatimTransport, WeatherLocationService and
+    WeatherLocationManager (instrumentation=...). They leave it as None by
+    default, which costs one 'is not None' check per stage.
+
+    Stage histograms: validate, cache_check, geocode, shape, cache_store, save,
+    and upstream_<endpoint> for the HTTP round trip.
+    Counters: cache_hits, cache_misses, negative_cache_hits, invalid_inputs,
+    upstream_status_<code> (or upstream_status_error) and upstream_bytes.
+    """
+
+    def __init__(self):
+        self.histograms = {}
+        self.counters = {}
+        self.hooks = []  # Called as hook(kind, name, value) for every observation
+        self.lock = threading.Lock()
+
+    def add_hook(self, hook):
+        """Also send every observation to hook(kind, name, value), e.g. to export it elsewhere"""
+        self.hooks.append(hook)
+
+    def lap(self, stage, started):
+        """Record the time since started for a stage and return now, for timing the next stage"""
+        now = time.perf_counter()
+        self.observe(stage, now - started)
+        return now
+
+    def observe(self, name, seconds):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            histogram.record(seconds)
+        for hook in self.hooks:
+            hook('timing', name, seconds)
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+        for hook in self.hooks:
+            hook('counter', name, amount)
+
+    def record_upstream(self, endpoint, status_code, size, seconds):
+        """One HTTP exchange with Nominatim (status_code is None for a network error)"""
+        self.count(f"upstream_status_{status_code if status_code is not None else 'error'}")
+        self.count('upstream_bytes', size)
+        self.observe(f"upstream_{endpoint}", seconds)
+
+    def export(self):
+        """Counters and histogram summaries as plain data (ready for json.dumps)"""
+        with self.lock:
+            return {
+                'counters': dict(self.counters),
+                'histograms': {name: histogram.to_dict() for name, histogram in self.histograms.items()}
+            }
+
+    def dump(self):
+        """Print a readable report"""
+        snapshot = self.export()
+        print(f"{'Stage':<18} {'Count':>7} {'Mean ms':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        for name, summary in sorted(snapshot['histograms'].items()):
+            print(f"{name:<18} {summary['count']:>7} {summary['mean_ms']:>9.3f} {summary['p50_ms']:>8.3f} "
+                  f"{summary['p95_ms']:>8.3f} {summary['p99_ms']:>8.3f}")
+        print("Counters: " + ', '.join(f"{name}={value:,}" for name, value in sorted(snapshot['counters'].items())))
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {}
+            self.counters = {}
+
+# Demonstrate instrumenting a realistic mixed workload
+print("\nPipeline Instrumentation Demonstration:")
+print("=" * 45)
+
+instrumentation = Instrumentation()
+slow_stages = []
+
+def note_slow_stage(kind, name, value):
+    if kind == 'timing' and value > 0.005:
+        slow_stages.append(name)
+
+instrumentation.add_hook(note_slow_stage)
+
+instrumented_stand_in = LocalNominatimStandIn(latency=0.002, error_rate=0.02, seed=29).start()
+instrumented_transport = NominatimTransport(base_url=instrumented_stand_in.base_url, max_retries=0,
+                                            instrumentation=instrumentation)
+instrumented_service = WeatherLocationService(geocoder=SimpleGeocoder(transport=instrumented_transport),
+                                              instrumentation=instrumentation)
+
+city_names = synthetic_city_names(500, seed=29)
+workload = zipf_workload(city_names, 2000, seed=29) + ["NonexistentCity12345", "x"] * 20
+
+with silenced_logs():
+    for city in workload:
+        instrumented_service.process_location_request(city)
+
+instrumentation.dump()
+print(f"Hook saw {len(slow_stages)} stage timings over 5 ms, in: {', '.join(sorted(set(slow_stages))) or 'none'}")
+print(f"Exported for a dashboard: {json.dumps(instrumentation.export()['histograms']['geocode'])[:80]}...")
+
+# What does it cost? Time cache hits with and without instrumentation
+plain_service = WeatherLocationService(geocoder=SimpleGeocoder(transport=instrumented_transport))
+for service in (plain_service, instrumented_service):
+    with silenced_logs():
+        service.process_location_request(city_names[0])
+
+for label, service in (("off", plain_service), ("on", instrumented_service)):
+    with silenced_logs():
+        start = time.perf_counter()
+        for _ in range(20000):
+            service.process_location_request(city_names[0])
+        elapsed = time.perf_counter() - start
+    print(f"Cached request with instrumentation {label:>3}: {elapsed / 20000 * 1_000_000:.2f} µs")
+
+instrumented_transport.close()
+instrumented_stand_in.stop()
@@ -0,0 +1,64 @@
+## Keeping Console I/O Off the Request Path:
+
+class SlowConsole:
+    """A stream that takes a while per write, like a busy terminal or a piped log collector"""
+
+    def __init__(self, delay=0.0002):
+        self.delay = delay
+        self.lines = 0
+
+    def write(self, text):
+        time.sleep(self.delay)
+        self.lines += text.count('\n')
+
+    def flush(self):
+        pass
+
+def time_cached_requests(service, city, count=2000):
+    """Average seconds per request the caller waits, for requests answered from the cache"""
+    start = time.perf_counter()
+    for _ in range(count):
+        service.process_location_request(city)
+    return (time.perf_counter() - start) / count
+
+print("\nAsync Logging Demonstration:")
+print("=" * 45)
+
+logging_stand_in = LocalNominatimStandIn().start()
+logging_service = WeatherLocationService(
+    geocoder=SimpleGeocoder(transport=NominatimTransport(base_url=logging_stand_in.base_url))
+)
+pipeline_log = logging.getLogger('weather_locations')
+
+# Every cached request logs "Using cached result ..." at DEBUG level
+with silenced_logs():
+    logging_service.process_location_request("Springfield")
+disable_console_output()
+
+pipeline_log.setLevel(logging.INFO)  # What an application runs with: DEBUG records are skipped
+off_cost = time_cached_requests(logging_service, "Springfield")
+
+sync_console = SlowConsole()
+sync_handler = logging.StreamHandler(sync_console)
+pipeline_log.setLevel(logging.DEBUG)
+pipeline_log.addHandler(sync_handler)
+sync_cost = time_cached_requests(logging_service, "Springfield")
+pipeline_log.removeHandler(sync_handler)
+
+async_console = SlowConsole()
+with AsyncLogSink(logging.StreamHandler(async_console), level=logging.DEBUG):
+    async_cost = time_cached_requests(logging_service, "Springfield")
+    queued_at_return = 2000 - async_console.lines
+
+print(f"DEBUG records skipped by level:     {off_cost * 1_000_000:8.1f} µs per request")
+print(f"Synchronous handler, slow console:  {sync_cost * 1_000_000:8.1f} µs per request")
+print(f"AsyncLogSink, same slow console:    {async_cost * 1_000_000:8.1f} µs per request")
+print(f"Lines still queued when the requests finished: {queued_at_return}, "
+      f"written after stop(): {async_console.lines}")
+
+# The lessons' human-readable output is one opt-in handler away
+enable_console_output()
+logging_service.process_location_request("Springfield")
+
+logging_service.geocoder.transport.close()
+logging_stand_in.stop()
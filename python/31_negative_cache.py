@@ -0,0 +1,66 @@
+## Remembering "Not Found": Negative Caching:
+
+def typo_names(names, count, seed=0):
+    """Misspelled names no place starts with ('Q' never begins a synthetic syllable)"""
+    chooser = random.Random(seed)
+    return ['Q' + chooser.choice(names).lower() for _ in range(count)]
+
+def count_upstream_calls(service, workload, stand_in):
+    """Send the workload through the service and return how many /search calls reached upstream"""
+    before = stand_in.stats['search']
+    with silenced_logs():
+        for city in workload:
+            service.process_location_request(city)
+    return stand_in.stats['search'] - before
+
+print("\nNegative Caching Demonstration:")
+print("=" * 45)
+
+negative_names = synthetic_city_names(300, seed=31)
+negative_stand_in = LocalNominatimStandIn(places=synthetic_places(negative_names, seed=31), seed=31).start()
+negative_transport = NominatimTransport(base_url=negative_stand_in.base_url, max_retries=0)
+
+# Real lookups mixed with a handful of typos that users (and bots) keep repeating
+typo_workload = zipf_workload(negative_names, 1500, seed=31) + zipf_workload(typo_names(negative_names, 20, seed=31),
+                                                                              500, seed=31)
+random.Random(31).shuffle(typo_workload)
+
+# negative_cache_ttl=0 expires every entry at once, i.e. no negative caching
+forgetful_service = WeatherLocationService(geocoder=SimpleGeocoder(transport=negative_transport),
+                                           negative_cache_ttl=0)
+negative_service = WeatherLocationService(geocoder=SimpleGeocoder(transport=negative_transport))
+
+forgetful_calls = count_upstream_calls(forgetful_service, typo_workload, negative_stand_in)
+negative_calls = count_upstream_calls(negative_service, typo_workload, negative_stand_in)
+print(f"Upstream calls for {len(typo_workload)} requests, 500 of them misspelled:")
+print(f"  Positive cache only:        {forgetful_calls}")
+print(f"  With negative cache:        {negative_calls}")
+print(f"  upstream_calls_saved:       {negative_service.stats['upstream_calls_saved']}")
+print(f"  Negative cache entries:     {len(negative_service.negative_cache)}")
+
+# Failures are not "not found": a 503 is not remembered, so the retry gets through
+unrequested_name = next(name for name in negative_names if name not in set(typo_workload))
+negative_stand_in.error_rate = 1.0
+with silenced_logs():
+    outage_result = negative_service.process_location_request(unrequested_name)
+negative_stand_in.error_rate = 0.0
+print(f"\nDuring an outage: success={outage_result['success']}, "
+      f"remembered as not found: {unrequested_name.lower() in negative_service.negative_cache}")
+retry_result = negative_service.process_location_request(unrequested_name)
+print(f"After it: success={retry_result['success']} ({retry_result['source']})")
+
+# A short TTL lets newly added places appear without clearing anything
+short_ttl_service = WeatherLocationService(geocoder=SimpleGeocoder(transport=negative_transport),
+                                           negative_cache_ttl=0.2)
+new_place = synthetic_places(["Brandnewton"], seed=31)[0]
+with silenced_logs():
+    before_result = short_ttl_service.process_location_request("Brandnewton")
+negative_stand_in.places.append(new_place)
+cached_result = short_ttl_service.process_location_request("Brandnewton")
+time.sleep(0.25)
+after_result = short_ttl_service.process_location_request("Brandnewton")
+print(f"New place: before={before_result['success']}, within TTL={cached_result['success']}, "
+      f"after TTL={after_result['success']}")
+
+negative_transport.close()
+negative_stand_in.stop()
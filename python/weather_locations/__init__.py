@@ -0,0 +1,294 @@
+"""
+Importable form of the numbered lesson files
+
+Every lesson both defines classes and runs a demo that talks to Nominatim or
+writes files. Importing this package runs none of that: the first time a name
+such as SimpleGeocoder is looked up, the definitions (imports, constants,
+functions and classes) of the lesson defining it and of the lessons those
+definitions use are loaded in order, and the demo statements are skipped. Heavy third-party modules are bound lazily and only
+imported when first used, so requests is not loaded until the first network call.
+
+    from weather_locations import WeatherLocationManager
+
+The demos are run explicitly instead:
+
+    python -m weather_locations demo [last_lesson]
+    python -m weather_locations import-time
+"""
+import ast
+import glob
+import importlib.util
+import logging
+import marshal
+import os
+import sys
+import threading
+import time
+
+LESSON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '__pycache__')
+
+# The classes log to 'weather_locations.*'; nothing is shown unless the application
+# configures logging (or calls enable_console_output() / starts an AsyncLogSink)
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+# Imported on first attribute access instead of when the lessons are loaded
+LAZY_MODULES = {'requests', 'numpy', 'asyncio'}
+
+load_times = {}  # Lesson file name -> seconds spent loading its definitions
+
+_load_lock = threading.Lock()
+_loaded = False
+_index = None
+
+def lesson_files():
+    """Paths of the numbered lesson files, in course order"""
+    return sorted(glob.glob(os.path.join(LESSON_DIR, '[0-9][0-9]_*.py')))
+
+def _lazy_module(name):
+    """Return a module that is only executed when one of its attributes is used"""
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+def _is_definition(node):
+    """True for statements that define something; everything else belongs to the demo"""
+    if isinstance(node, (ast.Import, ast.ImportFrom, ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        return True
+
+    if isinstance(node, ast.Assign):
+        # Module constants are UPPER_CASE or _private; demo variables are lowercase
+        return all(isinstance(target, ast.Name) and (target.id.isupper() or target.id.startswith('_'))
+                   for target in node.targets)
+
+    if isinstance(node, ast.Try):
+        # Optional dependencies: try: import numpy as np / except ImportError: np = None
+        return all(isinstance(statement, (ast.Import, ast.ImportFrom)) for statement in node.body)
+
+    return False
+
+class _LazyImports(ast.NodeTransformer):
+    """Rewrite 'import requests' into 'requests = _lazy_module("requests")'"""
+
+    def visit_Import(self, node):
+        statements = []
+        for alias in node.names:
+            if alias.name in LAZY_MODULES:
+                statements.append(ast.Assign(
+                    targets=[ast.Name(id=alias.asname or alias.name, ctx=ast.Store())],
+                    value=ast.Call(func=ast.Name(id='_lazy_module', ctx=ast.Load()),
+                                   args=[ast.Constant(alias.name)], keywords=[])
+                ))
+            else:
+                statements.append(ast.Import(names=[alias]))
+        return [ast.copy_location(statement, node) for statement in statements]
+
+def _parse_definitions(path):
+    """Syntax tree of one lesson file with the demo statements removed"""
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    tree.body = [node for node in tree.body if _is_definition(node)]
+    return tree
+
+def _compile_definitions(path):
+    """Compile only the definitions of one lesson file"""
+    tree = ast.fix_missing_locations(_LazyImports().visit(_parse_definitions(path)))
+    return compile(tree, path, 'exec')
+
+def _lesson_names(tree):
+    """
+    Names one lesson's definitions bind and refer to
+
+    Returns:
+        (names it defines, names it imports, other names its definitions use)
+    """
+    defined, imported, used = set(), set(), set()
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom, ast.Try)):
+            for child in ast.walk(node):
+                if isinstance(child, (ast.Import, ast.ImportFrom)):
+                    imported.update((alias.asname or alias.name).split('.')[0] for alias in child.names)
+                elif isinstance(child, ast.Name) and isinstance(child.ctx, ast.Store):
+                    imported.add(child.id)  # The np = None fallback of an optional import
+        elif isinstance(node, ast.Assign):
+            defined.update(target.id for target in node.targets)
+        else:
+            defined.add(node.name)
+        used.update(child.id for child in ast.walk(node) if isinstance(child, ast.Name))
+    return defined, imported, used - defined - imported
+
+def _read_cache(cache_path, stamp):
+    """Value cached under cache_path for this stamp, or None"""
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_stamp, value = marshal.load(f)
+        if tuple(cached_stamp) == stamp:
+            return value
+    except (OSError, EOFError, ValueError, TypeError):
+        pass  # Missing, stale or unreadable cache: rebuild it
+    return None
+
+def _write_cache(cache_path, stamp, value):
+    if not sys.dont_write_bytecode:
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(cache_path, 'wb') as f:
+                marshal.dump((stamp, value), f)
+        except OSError:
+            pass  # A read-only install just rebuilds every time
+
+def _definitions(path):
+    """
+    Compiled definitions of one lesson, cached in __pycache__ like a .pyc
+
+    Parsing and compiling is most of the load time, so the code object is
+    marshalled next to the package and reused while the lesson is unchanged.
+    """
+    source = os.stat(path)
+    stamp = (source.st_mtime_ns, source.st_size)
+    lesson = os.path.splitext(os.path.basename(path))[0]
+    cache_path = os.path.join(CACHE_DIR, f"{lesson}.{sys.implementation.cache_tag}.defs")
+
+    code = _read_cache(cache_path, stamp)
+    if code is None:
+        code = _compile_definitions(path)
+        _write_cache(cache_path, stamp, code)
+    return code
+
+def _lesson_index():
+    """Lesson file name -> _lesson_names() for every lesson, cached while no lesson changes"""
+    global _index
+    if _index is not None:
+        return _index
+
+    paths = lesson_files()
+    stamp = tuple((os.path.basename(path), os.stat(path).st_mtime_ns, os.stat(path).st_size) for path in paths)
+    cache_path = os.path.join(CACHE_DIR, f"lessons.{sys.implementation.cache_tag}.index")
+
+    index = _read_cache(cache_path, stamp)
+    if index is None:
+        index = {os.path.basename(path): _lesson_names(_parse_definitions(path)) for path in paths}
+        _write_cache(cache_path, stamp, index)
+    _index = index
+    return index
+
+def _lessons_needed(names, index, loaded):
+    """
+    Lessons to load so that names work: the lessons defining them, and recursively
+    the lessons defining what those use
+
+    Every lesson that (re)defines one of a loaded lesson's names is loaded with it,
+    so lessons loaded later never overwrite a redefinition. An imported module
+    only pulls in an importing lesson if no loaded lesson imports it already.
+    """
+    definers, importers = {}, {}
+    for lesson, (defined, imported, _) in index.items():
+        for name in defined:
+            definers.setdefault(name, []).append(lesson)
+        for name in imported:
+            importers.setdefault(name, []).append(lesson)
+
+    needed = set()
+    pending = list(names)
+    seen = set()
+    wanted_imports = set()
+    while pending:
+        while pending:
+            name = pending.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+
+            if name in definers:
+                for lesson in definers[name]:
+                    if lesson not in needed and lesson not in loaded:
+                        needed.add(lesson)
+                        defined, imported, used = index[lesson]
+                        pending.extend(defined)
+                        pending.extend(used)
+            elif name in importers:
+                wanted_imports.add(name)
+
+        # Imports no loaded or needed lesson provides come from the first lesson importing them
+        for name in sorted(wanted_imports):
+            if not any(name in index[lesson][1] for lesson in needed | loaded):
+                lesson = importers[name][0]
+                needed.add(lesson)
+                pending.extend(index[lesson][0] | index[lesson][2])
+    return needed
+
+def load(names=None):
+    """
+    Load lesson definitions into this package
+
+    Args:
+        names: Only load what these names need (every lesson if None)
+    """
+    global _loaded
+
+    with _load_lock:
+        if _loaded:
+            return
+
+        namespace = globals()
+        paths = lesson_files()
+        if names is not None:
+            needed = _lessons_needed(names, _lesson_index(), set(load_times))
+            paths = [path for path in paths if os.path.basename(path) in needed]
+
+        for path in paths:  # Course order, so later definitions still win
+            lesson = os.path.basename(path)
+            if lesson in load_times:
+                continue
+            start = time.perf_counter()
+            exec(_definitions(path), namespace)
+            load_times[lesson] = time.perf_counter() - start
+        _loaded = names is None or len(load_times) == len(lesson_files())
+
+def run_demos(last_lesson=None):
+    """
+    Run the lesson files top to bottom, demos included, the way the course reads
+
+    Later demos reuse variables from earlier ones, so every lesson up to
+    last_lesson runs in one shared namespace.
+
+    Args:
+        last_lesson: Number of the last lesson to run (all lessons if None)
+    """
+    namespace = {'__name__': '__main__'}
+    for path in lesson_files():
+        lesson_number = int(os.path.basename(path)[:2])
+        if last_lesson is not None and lesson_number > last_lesson:
+            break
+
+        print(f"\n######## {os.path.basename(path)}")
+        namespace['__file__'] = path  # Lessons find their data files relative to themselves
+        with open(path, encoding='utf-8') as f:
+            exec(compile(f.read(), path, 'exec'), namespace)
+    return namespace
+
+def __getattr__(name):
+    # Only called for names not defined yet, i.e. before their lessons are loaded
+    if name.startswith('__') or _loaded:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    load([name])
+    try:
+        return globals()[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+def __dir__():
+    load()
+    return sorted(globals())
@@ -0,0 +1,69 @@
+"""
+Entry points for the lesson demos and the import-time benchmark
+
+    python -m weather_locations demo [last_lesson]
+    python -m weather_locations import-time
+    python -m weather_locations bench [--latency 0.005 --error-rate 0.05] [--save FILE | --baseline FILE]
+"""
+import argparse
+import json
+import sys
+
+import weather_locations
+import weather_locations.import_time as import_time
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m weather_locations')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    demo = commands.add_parser('demo', help='Run the lesson demos in order')
+    demo.add_argument('last_lesson', nargs='?', type=int, help='Stop after this lesson number')
+
+    benchmark = commands.add_parser('import-time', help='Measure cold-start cost per lesson')
+    benchmark.add_argument('--repeats', type=int, default=5)
+
+    bench = commands.add_parser('bench', help='Run the offline benchmark suite')
+    bench.add_argument('--operations', type=int, default=500, help='Calls per scenario')
+    bench.add_argument('--latency', type=float, default=0.0, help='Simulated upstream latency in seconds')
+    bench.add_argument('--error-rate', type=float, default=0.0, help='Fraction of upstream requests that fail')
+    bench.add_argument('--result-count', type=int, default=1, help='Results per geocoding search response')
+    bench.add_argument('--seed', type=int, default=28)
+    bench.add_argument('--save', metavar='FILE', help='Write the results as a JSON baseline')
+    bench.add_argument('--baseline', metavar='FILE', help='Compare against a saved baseline')
+    bench.add_argument('--tolerance', type=float, default=0.25, help='Allowed throughput and p95 drift')
+
+    args = parser.parse_args(argv)
+    if args.command == 'demo':
+        weather_locations.run_demos(args.last_lesson)
+    elif args.command == 'import-time':
+        import_time.main(args.repeats)
+    else:
+        return run_bench(args)
+
+def run_bench(args):
+    """Run the suite, then save it as a baseline or compare it with one"""
+    results = weather_locations.run_benchmark_suite(
+        operations=args.operations,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        result_count=args.result_count,
+        seed=args.seed
+    )
+    weather_locations.print_benchmark_report(results)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSaved baseline to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = weather_locations.compare_to_baseline(results, baseline, args.tolerance)
+        print(f"\nRegressions against {args.baseline}: {len(regressions) or 'none'}")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
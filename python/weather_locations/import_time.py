@@ -0,0 +1,89 @@
+"""
+Cold-start cost of the weather_locations package
+
+Each measurement runs in a fresh interpreter so nothing is already imported.
+Compiled lesson definitions are cached in __pycache__ like any .pyc, so the
+first run (or a run with PYTHONDONTWRITEBYTECODE set) also pays for compiling.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PACKAGE_PARENT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What a worker pays at each step, timed inside the child interpreter
+STAGES = {
+    'import weather_locations': (
+        "import weather_locations"
+    ),
+    'first class lookup (loads its lessons)': (
+        "import weather_locations\n"
+        "weather_locations.SimpleGeocoder"
+    ),
+    'every lesson loaded': (
+        "import weather_locations\n"
+        "weather_locations.load()"
+    ),
+    'first transport (imports requests)': (
+        "import weather_locations\n"
+        "weather_locations.NominatimTransport()"
+    ),
+    'eager requests + numpy, for comparison': (
+        "import requests, numpy"
+    ),
+}
+
+CHILD_TEMPLATE = """
+import json, time
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+import sys
+package = sys.modules.get('weather_locations')
+print(json.dumps({{'elapsed': elapsed, 'load_times': getattr(package, 'load_times', {{}}),
+                  'requests_imported': 'requests.adapters' in sys.modules}}))
+"""
+
+def measure_stage(code, repeats=5):
+    """
+    Run code in fresh interpreters and report the median time it took
+
+    Returns:
+        dict with the median seconds, per-lesson load times from the last run and
+        whether requests was really imported
+    """
+    runs = []
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, '-c', CHILD_TEMPLATE.format(code=code)],
+            cwd=PACKAGE_PARENT, capture_output=True, text=True, check=True
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+
+    return {
+        'median': statistics.median(run['elapsed'] for run in runs),
+        'load_times': runs[-1]['load_times'],
+        'requests_imported': runs[-1]['requests_imported']
+    }
+
+def main(repeats=5):
+    print("Import-Time Benchmark:")
+    print("=" * 45)
+    if sys.dont_write_bytecode:
+        print("(PYTHONDONTWRITEBYTECODE is set: lesson definitions are recompiled every run)\n")
+
+    results = {label: measure_stage(code, repeats) for label, code in STAGES.items()}
+    for label, result in results.items():
+        requests_note = "requests loaded" if result['requests_imported'] else "requests not loaded"
+        print(f"{label:<42} {result['median'] * 1000:8.1f} ms   ({requests_note})")
+
+    load_times = results['every lesson loaded']['load_times']
+    print("\nDefinition load time per lesson:")
+    for lesson, seconds in sorted(load_times.items(), key=lambda item: item[1], reverse=True):
+        print(f"  {lesson:<34} {seconds * 1000:7.2f} ms")
+    print(f"  {'total':<34} {sum(load_times.values()) * 1000:7.2f} ms")
+
+if __name__ == '__main__':
+    main()